@@ -1,7 +1,10 @@
 """Authentication and tenant administration routes."""
 import logging
+from datetime import datetime
+from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, status
+from sqlalchemy import exists
 
 from app.config import settings
 from app.dependencies import (
@@ -37,16 +40,9 @@ async def organization_signup(
     auth_service: AuthServiceDep,
     tenant_service: TenantServiceDep,
 ):
-    if signup_data.subdomain:
-        existing = db.query(Tenant).filter(Tenant.subdomain == signup_data.subdomain).first()
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Subdomain already exists",
-            )
-
-    existing_user = db.query(TenantUser).filter(TenantUser.email == signup_data.admin_email).first()
-    if existing_user:
+    # Subdomain clashes are rejected by create_tenant's INSERT ... ON CONFLICT.
+    email_taken = db.query(exists().where(TenantUser.email == signup_data.admin_email)).scalar()
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
@@ -62,7 +58,7 @@ async def organization_signup(
 
     admin_user = auth_service.create_user(
         db=db,
-        tenant_id=str(tenant.id),
+        tenant_id=tenant.id,
         email=signup_data.admin_email,
         username=signup_data.admin_username,
         password=signup_data.admin_password,
@@ -92,7 +88,7 @@ async def organization_signup(
 @router.post("/register", response_model=UserResponse)
 async def register_user(
     user_data: UserCreate,
-    tenant_id: str,
+    tenant_id: UUID,
     db: DatabaseDep,
     auth_service: AuthServiceDep,
     tenant_service: TenantServiceDep,
@@ -193,13 +189,21 @@ async def list_tenants(
     tenant_service: TenantServiceDep,
     skip: int = 0,
     limit: int = 100,
+    after_created_at: datetime | None = None,
+    after_id: UUID | None = None,
 ):
-    return tenant_service.list_tenants(db, skip=skip, limit=limit)
+    if (after_created_at is None) != (after_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="after_created_at and after_id must be provided together",
+        )
+    after = (after_created_at, after_id) if after_created_at is not None else None
+    return tenant_service.list_tenants(db, skip=skip, limit=limit, after=after)
 
 
 @router.get("/tenants/{tenant_id}", response_model=TenantResponse)
 async def get_tenant(
-    tenant_id: str,
+    tenant_id: UUID,
     admin_user: AdminUserDep,
     db: DatabaseDep,
     tenant_service: TenantServiceDep,
@@ -212,7 +216,7 @@ async def get_tenant(
 
 @router.put("/tenants/{tenant_id}", response_model=TenantResponse)
 async def update_tenant(
-    tenant_id: str,
+    tenant_id: UUID,
     tenant_update: TenantUpdate,
     admin_user: AdminUserDep,
     db: DatabaseDep,
@@ -226,7 +230,7 @@ async def update_tenant(
 
 @router.delete("/tenants/{tenant_id}")
 async def deactivate_tenant(
-    tenant_id: str,
+    tenant_id: UUID,
     admin_user: AdminUserDep,
     db: DatabaseDep,
     tenant_service: TenantServiceDep,
@@ -240,7 +244,7 @@ async def deactivate_tenant(
 
 @router.get("/tenants/{tenant_id}/stats", response_model=TenantStats)
 async def get_tenant_stats(
-    tenant_id: str,
+    tenant_id: UUID,
     admin_user: AdminUserDep,
     db: DatabaseDep,
     tenant_service: TenantServiceDep,
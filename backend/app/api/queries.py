@@ -490,10 +490,15 @@ async def generate_rag_response_stream(
 
         async def iterator() -> AsyncGenerator[str, None]:
             try:
-                async for chunk in stream:
-                    if chunk:
-                        accumulated_chunks.append(chunk)
-                        yield f"data: {chunk}\n\n"
+                try:
+                    async for chunk in stream:
+                        if chunk:
+                            accumulated_chunks.append(chunk)
+                            yield f"data: {chunk}\n\n"
+                finally:
+                    # Close the provider stream eagerly when the client disconnects so the
+                    # upstream request is aborted instead of running until garbage collection.
+                    await stream.aclose()
                 full_response = "".join(accumulated_chunks)
                 assistant_metadata = {
                     "source": "rag_endpoint",
@@ -32,7 +32,7 @@ async def get_current_tenant_stats(
     tenant_service: TenantServiceDep,
 ) -> TenantStats:
     try:
-        return tenant_service.get_tenant_stats(db, str(current_tenant.id))
+        return tenant_service.get_tenant_stats(db, current_tenant.id)
     except Exception as exc:  # pragma: no cover - defensive logging
         logger.error(
             "Failed to get tenant stats",
@@ -16,6 +16,8 @@ class Settings(BaseSettings):
     qdrant_host: str = Field(default="localhost", env="QDRANT_HOST")
     qdrant_port: int = Field(default=6333, env="QDRANT_PORT")
     qdrant_api_key: str | None = Field(default=None, env="QDRANT_API_KEY")
+    qdrant_upsert_batch_size: int = Field(default=256, env="QDRANT_UPSERT_BATCH_SIZE")
+    qdrant_upsert_concurrency: int = Field(default=4, env="QDRANT_UPSERT_CONCURRENCY")
 
     jwt_secret_key: str = Field(env="JWT_SECRET_KEY")
     jwt_algorithm: str = Field(default="HS256", env="JWT_ALGORITHM")
@@ -24,6 +26,9 @@ class Settings(BaseSettings):
     openai_api_key: str | None = Field(default=None, env="OPENAI_API_KEY")
     anthropic_api_key: str | None = Field(default=None, env="ANTHROPIC_API_KEY")
     default_llm_provider: str = Field(default="openai", env="DEFAULT_LLM_PROVIDER")
+    llm_http_max_connections: int = Field(default=200, env="LLM_HTTP_MAX_CONNECTIONS")
+    llm_http_max_keepalive_connections: int = Field(default=100, env="LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    llm_http_timeout_seconds: float = Field(default=60.0, env="LLM_HTTP_TIMEOUT_SECONDS")
 
     embedding_model: str = Field(
         default="sentence-transformers/all-MiniLM-L6-v2",
@@ -48,6 +53,12 @@ class Settings(BaseSettings):
     cache_enabled: bool = Field(default=True, env="CACHE_ENABLED")
     cache_namespace: str = Field(default="mt_rag", env="CACHE_NAMESPACE")
     cache_ttl_seconds: int = Field(default=300, env="CACHE_TTL_SECONDS")
+    negative_cache_ttl_seconds: int = Field(default=30, env="NEGATIVE_CACHE_TTL_SECONDS")
+    tenant_cache_ttl_seconds: int = Field(default=30, env="TENANT_CACHE_TTL_SECONDS")
+
+    response_cache_enabled: bool = Field(default=False, env="RESPONSE_CACHE_ENABLED")
+    response_cache_similarity: float = Field(default=0.95, env="RESPONSE_CACHE_SIMILARITY")
+    response_cache_max_entries: int = Field(default=1024, env="RESPONSE_CACHE_MAX_ENTRIES")
 
     reranker_enabled: bool = Field(default=False, env="RERANKER_ENABLED")
     reranker_model: str = Field(
@@ -55,6 +66,9 @@ class Settings(BaseSettings):
         env="RERANKER_MODEL",
     )
     reranker_max_candidates: int = Field(default=25, env="RERANKER_MAX_CANDIDATES")
+    reranker_batch_size: int = Field(default=32, env="RERANKER_BATCH_SIZE")
+    reranker_max_length: int = Field(default=512, env="RERANKER_MAX_LENGTH")
+    reranker_cpu_threads: int | None = Field(default=None, env="RERANKER_CPU_THREADS")
 
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
     log_format: str = Field(default="json", env="LOG_FORMAT")
@@ -1,4 +1,9 @@
 """SQLAlchemy declarative base."""
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
+
+# JSONB on PostgreSQL, plain JSON elsewhere (SQLite in unit tests).
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
@@ -11,7 +11,8 @@ sqlite_mode = "sqlite" in settings.database_url
 
 engine = create_engine(
     settings.database_url,
-    pool_pre_ping=True,
+    # A StaticPool hands back the same local connection every time; pinging it is a wasted query.
+    pool_pre_ping=not sqlite_mode,
     echo=settings.debug,
     connect_args={"check_same_thread": False} if sqlite_mode else {},
     poolclass=StaticPool if sqlite_mode else None,
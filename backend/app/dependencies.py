@@ -6,6 +6,7 @@ from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_db
 from app.models.tenant import Tenant, TenantUser
 from app.services.agent_service import AgentService
@@ -16,6 +17,7 @@ from app.services.document_service import DocumentService
 from app.services.embedding_service import EmbeddingService
 from app.services.llm_service import LLMService
 from app.services.rerank_service import RerankService
+from app.services.response_cache_service import SemanticResponseCache
 from app.services.retrieval_service import RetrievalService
 from app.services.task_service import IncidentService, TaskService
 from app.services.tenant_service import TenantService
@@ -52,7 +54,10 @@ def get_vector_service() -> QdrantVectorService:
 
 @lru_cache
 def _cached_llm_service() -> LLMService:
-    return LLMService()
+    response_cache = None
+    if settings.response_cache_enabled:
+        response_cache = SemanticResponseCache(EmbeddingService())
+    return LLMService(response_cache=response_cache)
 
 
 def get_llm_service() -> LLMService:
@@ -156,7 +161,7 @@ async def get_current_tenant(
     db: Session = Depends(get_db),
     tenant_service: TenantService = Depends(get_tenant_service),
 ) -> Tenant:
-    tenant = tenant_service.get_tenant_by_id(db, str(current_user.tenant_id))
+    tenant = tenant_service.get_tenant_by_id(db, current_user.tenant_id)
     if not tenant or not tenant.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
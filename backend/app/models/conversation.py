@@ -5,10 +5,10 @@ import uuid
 from datetime import UTC, datetime
 
 from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
-from app.database.base import Base
+from app.database.base import Base, JSONDocument
 
 
 def _utcnow() -> datetime:
@@ -56,7 +56,7 @@ class ConversationMessage(Base):
 
     role = Column(String(32), nullable=False)
     content = Column(Text, nullable=False)
-    message_metadata = Column("metadata", JSONB, default=dict)
+    message_metadata = Column("metadata", JSONDocument, default=dict)
     sequence = Column(Integer, nullable=False)
 
     created_at = Column(DateTime, default=_utcnow, index=True)
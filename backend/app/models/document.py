@@ -2,11 +2,11 @@
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
-from app.database.base import Base
+from app.database.base import Base, JSONDocument
 
 
 def _utcnow() -> datetime:
@@ -16,6 +16,10 @@ def _utcnow() -> datetime:
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        # Tenant first, status second: per-tenant status counts become index-only scans.
+        Index("ix_documents_tenant_status", "tenant_id", "status"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False, index=True)
@@ -27,8 +31,8 @@ class Document(Base):
     file_path = Column(String(500), nullable=False)
 
     status = Column(String(50), default="uploaded", index=True)
-    total_chunks = Column(Integer, default=0)
-    processed_chunks = Column(Integer, default=0)
+    total_chunks = Column(Integer, default=0, server_default="0")
+    processed_chunks = Column(Integer, default=0, server_default="0")
 
     title = Column(String(500), nullable=True)
     summary = Column(Text, nullable=True)
@@ -38,8 +42,8 @@ class Document(Base):
     collection_name = Column(String(100), nullable=True)
     embedding_model = Column(String(100), nullable=True)
 
-    doc_metadata = Column(JSONB, default=dict)
-    tags = Column(JSONB, default=list)
+    doc_metadata = Column(JSONDocument, default=dict)
+    tags = Column(JSONDocument, default=list)
 
     uploaded_at = Column(DateTime, default=_utcnow, index=True)
     processed_at = Column(DateTime, nullable=True)
@@ -73,7 +77,7 @@ class DocumentChunk(Base):
     embedding_dimension = Column(Integer, nullable=True)
 
     last_similarity_score = Column(Float, nullable=True)
-    doc_metadata = Column(JSONB, default=dict)
+    doc_metadata = Column(JSONDocument, default=dict)
 
     created_at = Column(DateTime, default=_utcnow, index=True)
     updated_at = Column(DateTime, default=_utcnow, onupdate=_utcnow)
@@ -3,10 +3,10 @@ import uuid
 from datetime import UTC, datetime
 
 from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
-from app.database.base import Base
+from app.database.base import Base, JSONDocument
 
 
 def _utcnow() -> datetime:
@@ -28,7 +28,7 @@ class Query(Base):
     status = Column(String(50), default="completed", index=True)
 
     retrieved_chunks_count = Column(Integer, default=0)
-    retrieved_documents = Column(JSONB, default=list)
+    retrieved_documents = Column(JSONDocument, default=list)
     similarity_threshold = Column(Float, default=0.7)
 
     llm_provider = Column(String(50), nullable=True)
@@ -46,7 +46,7 @@ class Query(Base):
     session_id = Column(String(100), nullable=True, index=True)
     conversation_turn = Column(Integer, default=1)
 
-    query_metadata = Column(JSONB, default=dict)
+    query_metadata = Column(JSONDocument, default=dict)
 
     created_at = Column(DateTime, default=_utcnow, index=True)
     updated_at = Column(DateTime, default=_utcnow, onupdate=_utcnow)
@@ -70,10 +70,10 @@ class QueryResponse(Base):
     response_format = Column(String(50), default="text")
 
     context_used = Column(Text, nullable=True)
-    context_chunks = Column(JSONB, default=list)
+    context_chunks = Column(JSONDocument, default=list)
 
     confidence_score = Column(Float, nullable=True)
-    source_attribution = Column(JSONB, default=list)
+    source_attribution = Column(JSONDocument, default=list)
 
     contains_citations = Column(Boolean, default=False)
     fact_checked = Column(Boolean, default=False)
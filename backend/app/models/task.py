@@ -5,11 +5,11 @@ import uuid
 from datetime import UTC, datetime
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, Text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
-from app.database.base import Base
+from app.database.base import Base, JSONDocument
 
 
 def _utcnow() -> datetime:
@@ -49,8 +49,8 @@ class Task(Base):
     description = Column(Text, nullable=True)
     status = Column(String(32), nullable=False, default=TaskStatus.OPEN.value, index=True)
     priority = Column(String(16), nullable=False, default=TaskPriority.MEDIUM.value, index=True)
-    tags = Column(JSONB, default=list)
-    task_metadata = Column(JSONB, default=dict)
+    tags = Column(JSONDocument, default=list)
+    task_metadata = Column(JSONDocument, default=dict)
 
     due_date = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
@@ -88,6 +88,10 @@ class Incident(Base):
     """Incident records tied to a tenant."""
 
     __tablename__ = "incidents"
+    __table_args__ = (
+        # Covers the windowed severity/status GROUP BY in summarize_incidents (index-only scan).
+        Index("ix_incidents_tenant_detected_severity_status", "tenant_id", "detected_at", "severity", "status"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False, index=True)
@@ -100,9 +104,9 @@ class Incident(Base):
     severity = Column(String(16), nullable=False, default=IncidentSeverity.MEDIUM.value, index=True)
     status = Column(String(32), nullable=False, default=IncidentStatus.OPEN.value, index=True)
 
-    impacted_systems = Column(JSONB, default=list)
-    tags = Column(JSONB, default=list)
-    incident_metadata = Column(JSONB, default=dict)
+    impacted_systems = Column(JSONDocument, default=list)
+    tags = Column(JSONDocument, default=list)
+    incident_metadata = Column(JSONDocument, default=dict)
 
     detected_at = Column(DateTime, default=_utcnow, index=True)
     acknowledged_at = Column(DateTime, nullable=True)
@@ -2,7 +2,7 @@
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -16,6 +16,7 @@ def _utcnow() -> datetime:
 
 class Tenant(Base):
     __tablename__ = "tenants"
+    __table_args__ = (Index("ix_tenants_created_at_id", "created_at", "id"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False, index=True)
@@ -49,6 +50,7 @@ class Tenant(Base):
 
 class TenantUser(Base):
     __tablename__ = "tenant_users"
+    __table_args__ = (Index("ix_tenant_users_tenant_active", "tenant_id", "is_active"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False, index=True)
@@ -8,16 +8,18 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
 import logging
 import sys
-from collections.abc import Awaitable, Callable, Iterable
+from collections.abc import Awaitable, Callable, Collection, Iterable, Iterator
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
 from time import perf_counter
+from typing import Any
 from uuid import UUID
 
+import orjson
 from sqlalchemy.orm import Session
 
 from app.database.session import SessionLocal
@@ -51,26 +53,42 @@ class SeedTenantSpec:
     documents: list[SeedDocumentSpec]
 
 
+@lru_cache(maxsize=1024)
 def _normalize_created_at(value: str) -> str:
-    candidate = value.strip()
-    if candidate.endswith("Z"):
-        candidate = candidate[:-1] + "+00:00"
-    try:
-        parsed = datetime.fromisoformat(candidate)
-    except ValueError:
-        parsed = datetime.strptime(candidate, "%Y-%m-%d")
-    return parsed.replace(microsecond=0).isoformat()
+    # Python 3.11+ parses bare dates and a trailing "Z" natively; seed corpora repeat dates.
+    return datetime.fromisoformat(value.strip()).replace(microsecond=0).isoformat()
 
 
 def load_seed_dataset(path: Path) -> list[SeedTenantSpec]:
-    if not path.exists():
-        raise FileNotFoundError(f"Seed dataset not found: {path}")
+    """Parse the seed corpus; unchanged files are served from cache, so treat specs as read-only."""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Seed dataset not found: {path}") from None
+    return list(_load_seed_dataset(str(path), mtime_ns))
+
+
+def iter_seed_dataset(path: Path, subdomains: Collection[str] | None = None) -> Iterator[SeedTenantSpec]:
+    """Yield tenant specs one at a time, skipping tenants outside ``subdomains`` (lowercase).
+
+    The file is read eagerly so a missing dataset fails here, not on the first ``next()``.
+    """
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Seed dataset not found: {path}") from None
+    return _iter_tenant_specs(orjson.loads(raw), subdomains)
 
-    payload = json.loads(path.read_text(encoding="utf-8"))
-    tenants_payload = payload.get("tenants", [])
-    tenants: list[SeedTenantSpec] = []
 
-    for tenant_entry in tenants_payload:
+@lru_cache(maxsize=8)
+def _load_seed_dataset(path: str, mtime_ns: int) -> tuple[SeedTenantSpec, ...]:
+    return tuple(_iter_tenant_specs(orjson.loads(Path(path).read_bytes())))
+
+
+def _iter_tenant_specs(payload: dict[str, Any], subdomains: Collection[str] | None = None) -> Iterator[SeedTenantSpec]:
+    for tenant_entry in payload.get("tenants", []):
+        if subdomains and tenant_entry["subdomain"].lower() not in subdomains:
+            continue
         documents: list[SeedDocumentSpec] = []
         for doc_entry in tenant_entry.get("documents", []):
             created_at = _normalize_created_at(doc_entry.get("created_at", datetime.now(UTC).date().isoformat()))
@@ -94,18 +112,14 @@ def load_seed_dataset(path: Path) -> list[SeedTenantSpec]:
                 )
             )
 
-        tenants.append(
-            SeedTenantSpec(
-                name=tenant_entry["name"],
-                subdomain=tenant_entry["subdomain"],
-                llm_provider=tenant_entry.get("llm_provider"),
-                llm_model=tenant_entry.get("llm_model"),
-                documents=documents,
-            )
+        yield SeedTenantSpec(
+            name=tenant_entry["name"],
+            subdomain=tenant_entry["subdomain"],
+            llm_provider=tenant_entry.get("llm_provider"),
+            llm_model=tenant_entry.get("llm_model"),
+            documents=documents,
         )
 
-    return tenants
-
 
 def _configure_logging(verbose: bool = False) -> None:
     level = logging.DEBUG if verbose else logging.INFO
@@ -219,8 +233,8 @@ async def _handle_purge(session: Session, service: DocumentService, args: argpar
 
 async def _handle_seed(session: Session, service: DocumentService, args: argparse.Namespace) -> None:
     dataset_path = Path(args.dataset).expanduser()
-    tenants_specs = load_seed_dataset(dataset_path)
     tenant_filter = {value.lower() for value in args.tenants} if args.tenants else set()
+    tenants_specs = iter_seed_dataset(dataset_path, tenant_filter)
 
     tenant_service = TenantService()
 
@@ -231,9 +245,6 @@ async def _handle_seed(session: Session, service: DocumentService, args: argpars
     logger.info("Seeding corpus from %s", dataset_path)
 
     for tenant_spec in tenants_specs:
-        if tenant_filter and tenant_spec.subdomain.lower() not in tenant_filter:
-            continue
-
         tenant = tenant_service.get_tenant_by_subdomain(session, tenant_spec.subdomain)
         if tenant is None:
             if not args.create_missing_tenants:
@@ -255,7 +255,7 @@ def ensure_user(
         return existing
     return auth_service.create_user(
         db=db_session,
-        tenant_id=str(tenant_id),
+        tenant_id=tenant_id,
         email=email,
         username=username,
         password=password,
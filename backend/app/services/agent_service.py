@@ -97,7 +97,7 @@ class AgentService:
                 model=llm_model,
             )
             return AgentExecution(
-                intent=AgentIntent(**intent.model_dump()),
+                intent=AgentIntent(**intent.to_dict()),
                 result=AgentResult(response="", contexts=[], strategy=strategy, subqueries=[]),
                 action=action_result,
             )
@@ -107,7 +107,7 @@ class AgentService:
                 "I need a bit more detail to assist. Could you restate what action or analysis you expect?"
             )
             return AgentExecution(
-                intent=AgentIntent(**intent.model_dump()),
+                intent=AgentIntent(**intent.to_dict()),
                 result=AgentResult(response=clarification, contexts=[], strategy=strategy, subqueries=[]),
                 action=None,
             )
@@ -122,7 +122,7 @@ class AgentService:
             strategy=strategy,
         )
         return AgentExecution(
-            intent=AgentIntent(**intent.model_dump()),
+            intent=AgentIntent(**intent.to_dict()),
             result=retrieval,
             action=None,
         )
@@ -359,6 +359,7 @@ class AgentService:
                 query_embedding=vector,
                 limit=max_chunks,
                 score_threshold=score_threshold,
+                payload_fields=(),
             )
             items = search_results.items
 
@@ -6,7 +6,7 @@ from uuid import UUID
 from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, exists, or_
 from sqlalchemy.orm import Session
 
 from app.config import settings
@@ -100,16 +100,16 @@ class AuthService:
     def create_user(
         self,
         db: Session,
-        tenant_id: str,
+        tenant_id: UUID,
         email: str,
         username: str,
         password: str,
         role: str = "user",
     ) -> TenantUser:
-        existing_user = db.query(TenantUser).filter(
-            and_(TenantUser.email == email, TenantUser.tenant_id == tenant_id)
-        ).first()
-        if existing_user:
+        user_exists = db.query(
+            exists().where(and_(TenantUser.email == email, TenantUser.tenant_id == tenant_id))
+        ).scalar()
+        if user_exists:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User already exists in this tenant",
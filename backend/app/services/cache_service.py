@@ -3,11 +3,12 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
-import json
 import logging
 from collections.abc import Iterable
 from typing import Any
 
+import orjson
+
 try:  # redis is optional during testing; degrade gracefully when absent
     from redis.asyncio import Redis
 except Exception:  # pragma: no cover - fallback when redis is unavailable
@@ -17,6 +18,17 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _dumps(value: Any) -> bytes:
+    # Serialises numpy embeddings directly, without a .tolist() round trip.
+    return orjson.dumps(value, option=_ORJSON_OPTIONS)
+
+
+def _loads(payload: str | bytes) -> Any:
+    return orjson.loads(payload)
+
 
 class CacheService:
     """Thin wrapper around Redis for JSON payload caching."""
@@ -85,8 +97,8 @@ class CacheService:
         if not payload:
             return None
         try:
-            return json.loads(payload)
-        except json.JSONDecodeError:
+            return _loads(payload)
+        except orjson.JSONDecodeError:
             logger.warning("Cache returned invalid JSON", extra={"key": key})
             return None
 
@@ -97,7 +109,7 @@ class CacheService:
         key = self._normalise_parts(parts)
         ttl_seconds = ttl if ttl is not None else self.default_ttl
         try:
-            payload = json.dumps(value)
+            payload = _dumps(value)
             if ttl_seconds > 0:
                 await client.setex(key, ttl_seconds, payload)
             else:
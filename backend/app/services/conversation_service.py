@@ -224,10 +224,10 @@ class ConversationService:
         if not candidate:
             return None
 
-        session.title = candidate[:255]
+        title = candidate[:255]
+        session.title = title
         db.commit()
-        db.refresh(session)
-        return session.title
+        return title
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -9,6 +9,7 @@ from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 from fastapi import HTTPException, UploadFile, status
 from sqlalchemy import delete
 from sqlalchemy.orm import Session
@@ -157,7 +158,7 @@ class DocumentService:
 
         for chunk in embedded_chunks:
             chunk_id = uuid.uuid4()
-            vector_id = str(uuid.uuid4())
+            vector_id = QdrantVectorService.point_id(str(document.tenant_id), str(document.id), str(chunk_id))
             start_val = chunk.get("start_char")
             end_val = chunk.get("end_char")
             page_number = chunk.get("page_number")
@@ -183,7 +184,6 @@ class DocumentService:
                     "document_id": str(document.id),
                     "chunk_id": str(chunk_id),
                     "text": record.text_content,
-                    "embedding": chunk["embedding"],
                     "source": document.original_filename,
                     "page_number": record.page_number,
                     "chunk_index": record.chunk_index,
@@ -208,7 +208,12 @@ class DocumentService:
         db.add_all(chunk_records)
         db.commit()
 
-        success = await self.vector_service.add_documents(tenant_id=str(document.tenant_id), documents=vector_payloads)
+        embeddings = np.asarray([chunk["embedding"] for chunk in embedded_chunks], dtype=np.float32)
+        success = await self.vector_service.add_documents(
+            tenant_id=str(document.tenant_id),
+            documents=vector_payloads,
+            embeddings=embeddings,
+        )
         if not success:
             document.status = "failed"
             db.commit()
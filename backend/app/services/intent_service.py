@@ -1,15 +1,18 @@
 """Intent classification for routing user queries."""
 from __future__ import annotations
 
-import json
 import re
+from dataclasses import dataclass, field
 from enum import Enum
+from typing import TYPE_CHECKING, Any
 
-from pydantic import BaseModel, Field
+import orjson
 
-from app.services.llm_service import LLMService
 from app.services.prompt_template_service import PromptTemplateService
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from app.services.llm_service import LLMService
+
 
 class IntentType(str, Enum):
     INFORMATIONAL = "informational"
@@ -18,14 +21,69 @@ class IntentType(str, Enum):
     CLARIFY = "clarify"
 
 
-class IntentResult(BaseModel):
+# Heuristic keyword groups in priority order: earlier groups win when several match.
+_HEURISTIC_KEYWORDS: tuple[tuple[IntentType, float, tuple[str, ...]], ...] = (
+    (IntentType.CLARIFY, 0.6, ("what do you mean", "clarify", "can you explain", "not sure")),
+    (IntentType.ACTION, 0.6, ("create", "open", "schedule", "assign", "escalate", "log a task")),
+    (IntentType.ANALYTICAL, 0.5, ("compare", "trend", "analysis", "impact", "metric", "root cause")),
+)
+_KEYWORD_TO_RANK: dict[str, int] = {
+    keyword: rank for rank, (_, _, keywords) in enumerate(_HEURISTIC_KEYWORDS) for keyword in keywords
+}
+# Plain substring alternation (no word boundaries) to keep the original ``keyword in text`` semantics.
+_HEURISTIC_RE = re.compile("|".join(re.escape(keyword) for keyword in _KEYWORD_TO_RANK))
+
+
+@dataclass(slots=True)
+class IntentResult:
+    """Classifier output; confidence is clamped to [0, 1] by the producers."""
+
     intent: IntentType
-    confidence: float = Field(ge=0.0, le=1.0)
+    confidence: float
     reasoning: str = ""
-    entities: list[str] = Field(default_factory=list)
+    entities: list[str] = field(default_factory=list)
     requested_action: str | None = None
     raw_response: str | None = None
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "intent": self.intent,
+            "confidence": self.confidence,
+            "reasoning": self.reasoning,
+            "entities": list(self.entities),
+            "requested_action": self.requested_action,
+            "raw_response": self.raw_response,
+        }
+
+
+def _extract_first_json_object(payload: str) -> str | None:
+    """Return the first balanced ``{...}`` span in ``payload``, skipping braces inside strings."""
+    start = payload.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(payload)):
+        char = payload[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return payload[start : index + 1]
+    return None
+
 
 class IntentClassifier:
     """LLM-backed intent classifier with rule-based fallback."""
@@ -67,18 +125,21 @@ class IntentClassifier:
 
     def _parse_response(self, payload: str) -> IntentResult | None:
         try:
-            data = json.loads(payload)
-        except json.JSONDecodeError:
+            data = orjson.loads(payload)
+        except orjson.JSONDecodeError:
             # Attempt to extract JSON fragment if the model wrapped it in prose
-            match = re.search(r"\{.*\}", payload, re.DOTALL)
-            if not match:
+            fragment = _extract_first_json_object(payload)
+            if fragment is None:
                 return None
             try:
-                data = json.loads(match.group(0))
-            except json.JSONDecodeError:
+                data = orjson.loads(fragment)
+            except orjson.JSONDecodeError:
                 return None
+        if not isinstance(data, dict):
+            return None
 
-        intent_value = str(data.get("intent", "")).lower().strip()
+        intent_value = data.get("intent")
+        intent_value = intent_value.strip().lower() if isinstance(intent_value, str) else ""
         try:
             intent_enum = IntentType(intent_value)
         except ValueError:
@@ -86,11 +147,21 @@ class IntentClassifier:
 
         confidence = float(data.get("confidence", 0.5))
         confidence = max(0.0, min(confidence, 1.0))
-        reasoning = str(data.get("reasoning", "")).strip()
+        reasoning = data.get("reasoning")
+        reasoning = reasoning.strip() if isinstance(reasoning, str) else ""
         entities: list[str] = []
-        raw_entities = data.get("entities", [])
-        if isinstance(raw_entities, list):
-            entities = [str(item).strip() for item in raw_entities if str(item).strip()]
+        raw_entities = data.get("entities")
+        if isinstance(raw_entities, list) and raw_entities:
+            for item in raw_entities:
+                # JSON already yields str; only bare numbers need converting.
+                if isinstance(item, str):
+                    item = item.strip()
+                elif isinstance(item, (int, float)):
+                    item = str(item)
+                else:
+                    continue
+                if item:
+                    entities.append(item)
         requested_action = data.get("requested_action")
         if isinstance(requested_action, str):
             requested_action = requested_action.strip() or None
@@ -106,22 +177,17 @@ class IntentClassifier:
         )
 
     def _heuristic_fallback(self, query: str) -> IntentResult:
-        lowered = query.lower()
-        action_keywords = ["create", "open", "schedule", "assign", "escalate", "log a task"]
-        analytical_keywords = ["compare", "trend", "analysis", "impact", "metric", "root cause"]
-        clarify_keywords = ["what do you mean", "clarify", "can you explain", "not sure"]
-
         intent = IntentType.INFORMATIONAL
         confidence = 0.3
 
-        if any(keyword in lowered for keyword in clarify_keywords):
-            intent = IntentType.CLARIFY
-            confidence = 0.6
-        elif any(keyword in lowered for keyword in action_keywords):
-            intent = IntentType.ACTION
-            confidence = 0.6
-        elif any(keyword in lowered for keyword in analytical_keywords):
-            intent = IntentType.ANALYTICAL
-            confidence = 0.5
+        best_rank: int | None = None
+        for match in _HEURISTIC_RE.finditer(query.lower()):
+            rank = _KEYWORD_TO_RANK[match.group()]
+            if best_rank is None or rank < best_rank:
+                best_rank = rank
+                if rank == 0:
+                    break
+        if best_rank is not None:
+            intent, confidence, _ = _HEURISTIC_KEYWORDS[best_rank]
 
         return IntentResult(intent=intent, confidence=confidence, reasoning="heuristic fallback", entities=[])
@@ -1,15 +1,24 @@
 """Provider-agnostic LLM service for RAG responses."""
 from __future__ import annotations
 
+import importlib.util
 import logging
 from collections.abc import AsyncGenerator
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from fastapi import HTTPException
 
 from app.config import settings
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from app.services.response_cache_service import SemanticResponseCache
+
+try:  # Shipped with the provider SDKs
+    import httpx
+except Exception:  # pragma: no cover - dependency optional
+    httpx = None  # type: ignore
+
 try:  # Optional OpenAI dependency
     from openai import AsyncOpenAI
 except Exception:  # pragma: no cover - dependency optional
@@ -22,6 +31,22 @@ except Exception:  # pragma: no cover
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 needs the optional ``h2`` package; without it httpx silently negotiates HTTP/1.1 only.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+OPENAI_MODELS: tuple[str, ...] = (
+    "gpt-4o-mini",
+    "gpt-4o",
+    "gpt-4.1-mini",
+    "gpt-3.5-turbo",
+)
+
+ANTHROPIC_MODELS: tuple[str, ...] = (
+    "claude-3-haiku-20240307",
+    "claude-3-sonnet-20240229",
+    "claude-3-opus-20240229",
+)
+
 
 @dataclass
 class LLMResponse:
@@ -60,8 +85,8 @@ class BaseProvider:
     ) -> AsyncGenerator[str, None]:
         raise NotImplementedError
 
-    def get_available_models(self) -> list[str]:
-        return []
+    def get_available_models(self) -> tuple[str, ...]:
+        return ()
 
 
 class OpenAIProvider(BaseProvider):
@@ -69,10 +94,10 @@ class OpenAIProvider(BaseProvider):
 
     name = "openai"
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, http_client: httpx.AsyncClient | None = None) -> None:
         if AsyncOpenAI is None:
             raise RuntimeError("openai package not installed")
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.client = AsyncOpenAI(api_key=api_key, http_client=http_client)
 
     async def generate_response(
         self,
@@ -121,20 +146,20 @@ class OpenAIProvider(BaseProvider):
         )
 
         async def iterator() -> AsyncGenerator[str, None]:
-            async for chunk in stream:
-                delta = chunk.choices[0].delta.content
-                if delta:
-                    yield delta
+            try:
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            finally:
+                # Release the connection as soon as the consumer stops (e.g. client disconnect)
+                # so OpenAI stops generating tokens we will never send.
+                await stream.close()
 
         return iterator()
 
-    def get_available_models(self) -> list[str]:
-        return [
-            "gpt-4o-mini",
-            "gpt-4o",
-            "gpt-4.1-mini",
-            "gpt-3.5-turbo",
-        ]
+    def get_available_models(self) -> tuple[str, ...]:
+        return OPENAI_MODELS
 
 
 class AnthropicProvider(BaseProvider):
@@ -142,10 +167,10 @@ class AnthropicProvider(BaseProvider):
 
     name = "anthropic"
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, http_client: httpx.AsyncClient | None = None) -> None:
         if AsyncAnthropic is None:
             raise RuntimeError("anthropic package not installed")
-        self.client = AsyncAnthropic(api_key=api_key)
+        self.client = AsyncAnthropic(api_key=api_key, http_client=http_client)
 
     async def generate_response(
         self,
@@ -215,12 +240,8 @@ class AnthropicProvider(BaseProvider):
 
         return iterator()
 
-    def get_available_models(self) -> list[str]:
-        return [
-            "claude-3-haiku-20240307",
-            "claude-3-sonnet-20240229",
-            "claude-3-opus-20240229",
-        ]
+    def get_available_models(self) -> tuple[str, ...]:
+        return ANTHROPIC_MODELS
 
 
 class FallbackProvider(BaseProvider):
@@ -263,28 +284,51 @@ class FallbackProvider(BaseProvider):
 class LLMService:
     """Facade for orchestrating RAG prompts across providers."""
 
-    def __init__(self) -> None:
+    def __init__(self, response_cache: SemanticResponseCache | None = None) -> None:
+        self.response_cache = response_cache
         self.providers: dict[str, BaseProvider] = {}
         self._initialize_providers()
         self.default_provider = settings.default_llm_provider or next(iter(self.providers))
+        # Providers are fixed after initialisation, so resolve their default models once.
+        self._default_models: dict[str, str] = {}
+        for name, provider in self.providers.items():
+            options = provider.get_available_models()
+            self._default_models[name] = options[0] if options else "default"
 
     def _resolve_model(self, provider: BaseProvider, requested: str | None) -> str:
         if requested:
             return requested
-        options = provider.get_available_models()
-        return options[0] if options else "default"
+        return self._default_models.get(provider.name, "default")
+
+    @staticmethod
+    def _build_http_client() -> httpx.AsyncClient | None:
+        if httpx is None:
+            return None
+        # One pool shared by every provider so concurrent calls reuse warm TLS connections.
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.llm_http_max_connections,
+                max_keepalive_connections=settings.llm_http_max_keepalive_connections,
+            ),
+            timeout=httpx.Timeout(settings.llm_http_timeout_seconds),
+        )
 
     def _initialize_providers(self) -> None:
+        self.http_client = None
+        if settings.openai_api_key or settings.anthropic_api_key:
+            self.http_client = self._build_http_client()
+
         if settings.openai_api_key:
             try:
-                self.providers["openai"] = OpenAIProvider(settings.openai_api_key)
+                self.providers["openai"] = OpenAIProvider(settings.openai_api_key, self.http_client)
                 logger.info("OpenAI provider initialized")
             except Exception as exc:  # pragma: no cover - init failures logged
                 logger.warning("Failed to initialise OpenAI provider", extra={"error": str(exc)})
 
         if settings.anthropic_api_key:
             try:
-                self.providers["anthropic"] = AnthropicProvider(settings.anthropic_api_key)
+                self.providers["anthropic"] = AnthropicProvider(settings.anthropic_api_key, self.http_client)
                 logger.info("Anthropic provider initialized")
             except Exception as exc:  # pragma: no cover
                 logger.warning("Failed to initialise Anthropic provider", extra={"error": str(exc)})
@@ -295,9 +339,10 @@ class LLMService:
 
     def get_provider(self, name: str | None) -> BaseProvider:
         provider_name = name or self.default_provider
-        if provider_name not in self.providers:
-            raise HTTPException(status_code=400, detail=f"Unsupported LLM provider '{provider_name}'")  # type: ignore[name-defined]
-        return self.providers[provider_name]
+        provider = self.providers.get(provider_name)
+        if provider is None:
+            raise HTTPException(status_code=400, detail=f"Unsupported LLM provider '{provider_name}'")
+        return provider
 
     def build_rag_messages(
         self,
@@ -378,13 +423,38 @@ class LLMService:
                 max_tokens=max_tokens,
             )
 
-        return await llm_provider.generate_response(
+        # Answers without retrieved context are cheap and not tenant-scoped; only cache grounded ones.
+        cache = self.response_cache if context_documents else None
+        context_key = ""
+        query_vector = None
+        if cache is not None:
+            context_key = cache.build_context_key(
+                query=query,
+                provider=llm_provider.name,
+                model=selected_model,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                context_documents=context_documents,
+                conversation_history=conversation_history,
+            )
+            query_vector = await cache.embed_query(query)
+            if query_vector is not None:
+                cached = await cache.lookup(context_key, query_vector)
+                if cached is not None:
+                    return cached
+
+        response = await llm_provider.generate_response(
             messages,
             model=selected_model,
             temperature=temperature,
             max_tokens=max_tokens,
         )
 
+        if cache is not None and query_vector is not None and response.provider != FallbackProvider.name:
+            await cache.store(context_key, query_vector, response)
+        return response
+
     async def generate_text_response(
         self,
         *,
@@ -413,6 +483,7 @@ class LLMService:
         return list(self.providers.keys())
 
     def get_provider_models(self, provider: str) -> list[str]:
-        if provider not in self.providers:
+        llm_provider = self.providers.get(provider)
+        if llm_provider is None:
             return []
-        return self.providers[provider].get_available_models()
+        return list(llm_provider.get_available_models())
@@ -1,128 +1,180 @@
 """Centralized prompt templates for the agent pipeline."""
 from __future__ import annotations
 
-from collections.abc import Iterable
+import heapq
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from string import Formatter
 from textwrap import dedent
+from types import MappingProxyType
+
+
+def _compile_template(template: str, **static: str) -> Callable[..., str]:
+    """Split a ``str.format`` template once so rendering is a single join.
+
+    ``static`` values are folded into the literal parts at compile time; the returned
+    callable fills the remaining fields by keyword and raises ``KeyError`` like
+    ``str.format`` when one is missing.
+    """
+    parts: list[str] = []
+    slots: list[tuple[int, str]] = []
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        if literal:
+            parts.append(literal)
+        if field_name is None:
+            continue
+        if format_spec or conversion:
+            raise ValueError(f"Unsupported format spec for field '{field_name}'")
+        if field_name in static:
+            parts.append(static[field_name])
+        else:
+            slots.append((len(parts), field_name))
+            parts.append("")
+    frozen_parts = tuple(parts)
+    frozen_slots = tuple(slots)
+
+    def render(**values: object) -> str:
+        rendered = list(frozen_parts)
+        for index, name in frozen_slots:
+            rendered[index] = str(values[name])
+        return "".join(rendered)
+
+    return render
+
+
+_ROLE_LABELS = MappingProxyType({"user": "User", "assistant": "Assistant"})
 
 
 class PromptTemplateService:
     """Utility container for agent prompt templates."""
 
-    FORMAT_INSTRUCTIONS = {
-        "bullet_list": "Format the response as a bulleted list containing only the requested items.",
-        "bullet_list_queries": "Return only the follow-up queries as bullet points, no prose.",
-        "json_intent": dedent(
-            """
-            Respond with valid JSON using this schema:
-            {
-              "intent": "informational | analytical | action | clarify",
-              "confidence": float between 0 and 1,
-              "reasoning": "short explanation",
-              "entities": ["key noun phrases"],
-              "requested_action": "action verb phrase if intent == action else null"
-            }
-            """
-        ).strip(),
-    }
-
-    AGENT_ROLES = {
-        "decomposer": dedent(
-            """
-            You are a research planner who breaks complex questions into precise follow-up queries.
-            """
-        ).strip(),
-        "synthesizer": dedent(
-            """
-            You combine evidence from multiple documents into a cohesive, well-structured answer with citations.
-            """
-        ).strip(),
-        "rag_assistant": dedent(
-            """
-            You are a document-grounded assistant. Base every answer on the provided context and cite sources.
-            """
-        ).strip(),
-    }
-
-    SYSTEM_MESSAGES = {
-        "rag": dedent(
-            """
-            You are a helpful assistant. Review the supplied context and clearly cite the supporting source for each fact.
-            If the context lacks relevant information, say so explicitly.
-            """
-        ).strip(),
-        "citation_focus": dedent(
-            """
-            You must attribute every factual statement to a specific context source using [Source X] notation.
-            Distinguish clearly between contextual evidence and general knowledge.
-            """
-        ).strip(),
-    }
-
-    INTENT_ANALYSIS = {
-        "classification": dedent(
-            """
-            Analyze the following query before answering it:
-
-            Query: {query}
-
-            1. Determine the user's intent category.
-            2. List the key entities or concepts.
-            3. Identify any implied actions or objectives.
-            4. Explain your reasoning briefly.
-
-            {format_instructions}
-            """
-        ).strip(),
-    }
-
-    DECOMPOSITION = {
-        "document_search": dedent(
-            """
-            {role}
-
-            Original Query: {query}
-
-            Break this query into 2-4 focused subquestions. Each subquestion should be self-contained,
-            target a specific aspect of the original query, and maximise relevance for document retrieval.
-
-            {format_instructions}
-            """
-        ).strip(),
-        "informed_decomposition": dedent(
-            """
-            {role}
-
-            Original Query: {query}
-
-            Initial Summary:
-            {initial_summary}
-
-            Context Snippets:
-            {context_snippets}
-
-            Suggest 2-3 follow-up questions that would close remaining gaps, resolve ambiguities, or surface
-            alternative perspectives. Avoid duplicating information already covered.
-
-            {format_instructions}
-            """
-        ).strip(),
-    }
-
-    SYNTHESIS = {
-        "standard": dedent(
-            """
-            {role}
-
-            Original Query: {query}
-
-            Findings:
-            {findings}
-
-            Write a concise, well-structured answer that integrates the findings, cites sources with [Source X],
-            and notes unresolved gaps or conflicting evidence.
-            """
-        ).strip(),
-    }
+    FORMAT_INSTRUCTIONS = MappingProxyType(
+        {
+            "bullet_list": "Format the response as a bulleted list containing only the requested items.",
+            "bullet_list_queries": "Return only the follow-up queries as bullet points, no prose.",
+            "json_intent": dedent(
+                """
+                Respond with valid JSON using this schema:
+                {
+                  "intent": "informational | analytical | action | clarify",
+                  "confidence": float between 0 and 1,
+                  "reasoning": "short explanation",
+                  "entities": ["key noun phrases"],
+                  "requested_action": "action verb phrase if intent == action else null"
+                }
+                """
+            ).strip(),
+        }
+    )
+
+    AGENT_ROLES = MappingProxyType(
+        {
+            "decomposer": dedent(
+                """
+                You are a research planner who breaks complex questions into precise follow-up queries.
+                """
+            ).strip(),
+            "synthesizer": dedent(
+                """
+                You combine evidence from multiple documents into a cohesive, well-structured answer with citations.
+                """
+            ).strip(),
+            "rag_assistant": dedent(
+                """
+                You are a document-grounded assistant. Base every answer on the provided context and cite sources.
+                """
+            ).strip(),
+        }
+    )
+
+    SYSTEM_MESSAGES = MappingProxyType(
+        {
+            "rag": dedent(
+                """
+                You are a helpful assistant. Review the supplied context and clearly cite the supporting source for each fact.
+                If the context lacks relevant information, say so explicitly.
+                """
+            ).strip(),
+            "citation_focus": dedent(
+                """
+                You must attribute every factual statement to a specific context source using [Source X] notation.
+                Distinguish clearly between contextual evidence and general knowledge.
+                """
+            ).strip(),
+        }
+    )
+
+    INTENT_ANALYSIS = MappingProxyType(
+        {
+            "classification": dedent(
+                """
+                Analyze the following query before answering it:
+
+                Query: {query}
+
+                1. Determine the user's intent category.
+                2. List the key entities or concepts.
+                3. Identify any implied actions or objectives.
+                4. Explain your reasoning briefly.
+
+                {format_instructions}
+                """
+            ).strip(),
+        }
+    )
+
+    DECOMPOSITION = MappingProxyType(
+        {
+            "document_search": dedent(
+                """
+                {role}
+
+                Original Query: {query}
+
+                Break this query into 2-4 focused subquestions. Each subquestion should be self-contained,
+                target a specific aspect of the original query, and maximise relevance for document retrieval.
+
+                {format_instructions}
+                """
+            ).strip(),
+            "informed_decomposition": dedent(
+                """
+                {role}
+
+                Original Query: {query}
+
+                Initial Summary:
+                {initial_summary}
+
+                Context Snippets:
+                {context_snippets}
+
+                Suggest 2-3 follow-up questions that would close remaining gaps, resolve ambiguities, or surface
+                alternative perspectives. Avoid duplicating information already covered.
+
+                {format_instructions}
+                """
+            ).strip(),
+        }
+    )
+
+    SYNTHESIS = MappingProxyType(
+        {
+            "standard": dedent(
+                """
+                {role}
+
+                Original Query: {query}
+
+                Findings:
+                {findings}
+
+                Write a concise, well-structured answer that integrates the findings, cites sources with [Source X],
+                and notes unresolved gaps or conflicting evidence.
+                """
+            ).strip(),
+        }
+    )
 
     ACTION_PLANNING = dedent(
         """
@@ -148,6 +200,31 @@ class PromptTemplateService:
         """
     ).strip()
 
+    # Templates are parsed once with static parts folded in; per-call rendering only joins user input.
+    _render_intent_prompt = staticmethod(
+        _compile_template(
+            INTENT_ANALYSIS["classification"],
+            format_instructions=FORMAT_INSTRUCTIONS["json_intent"],
+        )
+    )
+    _render_decomposition_prompt = staticmethod(
+        _compile_template(
+            DECOMPOSITION["document_search"],
+            role=AGENT_ROLES["decomposer"],
+            format_instructions=FORMAT_INSTRUCTIONS["bullet_list_queries"],
+        )
+    )
+    _render_informed_decomposition_prompt = staticmethod(
+        _compile_template(
+            DECOMPOSITION["informed_decomposition"],
+            role=AGENT_ROLES["decomposer"],
+            format_instructions=FORMAT_INSTRUCTIONS["bullet_list_queries"],
+        )
+    )
+    _render_synthesis_prompt = staticmethod(
+        _compile_template(SYNTHESIS["standard"], role=AGENT_ROLES["synthesizer"])
+    )
+
     CHAT_TITLE = dedent(
         """
         You are naming a conversational transcript. Use 3-6 words, Title Case, no punctuation at the end.
@@ -158,6 +235,7 @@ class PromptTemplateService:
         Title:
         """
     ).strip()
+    _render_chat_title_prompt = staticmethod(_compile_template(CHAT_TITLE))
 
     @classmethod
     def get_format_instruction(cls, key: str) -> str:
@@ -171,40 +249,32 @@ class PromptTemplateService:
     def get_system_message(cls, key: str) -> str:
         return cls.SYSTEM_MESSAGES.get(key, cls.SYSTEM_MESSAGES["rag"])
 
+    # Prompts are pure functions of their inputs; memoising them returns byte-identical strings
+    # for repeated turns, which also keeps provider-side prefix caches warm.
     @classmethod
+    @lru_cache(maxsize=1024)
     def intent_prompt(cls, query: str) -> str:
-        return cls.INTENT_ANALYSIS["classification"].format(
-            query=query,
-            format_instructions=cls.get_format_instruction("json_intent"),
-        )
+        return cls._render_intent_prompt(query=query)
 
     @classmethod
     def decomposition_prompt(cls, query: str, *, informed: bool = False, **kwargs: str) -> str:
         if informed:
-            return cls.DECOMPOSITION["informed_decomposition"].format(
-                role=cls.get_role("decomposer"),
+            return cls._render_informed_decomposition_prompt(
                 query=query,
                 initial_summary=kwargs.get("initial_summary", ""),
                 context_snippets=kwargs.get("context_snippets", ""),
-                format_instructions=cls.get_format_instruction("bullet_list_queries"),
             )
-        return cls.DECOMPOSITION["document_search"].format(
-            role=cls.get_role("decomposer"),
-            query=query,
-            format_instructions=cls.get_format_instruction("bullet_list_queries"),
-        )
+        return cls._render_decomposition_prompt(query=query)
 
     @classmethod
     def synthesis_prompt(cls, query: str, findings: str) -> str:
-        return cls.SYNTHESIS["standard"].format(
-            role=cls.get_role("synthesizer"),
-            query=query,
-            findings=findings,
-        )
+        return cls._render_synthesis_prompt(query=query, findings=findings)
 
     @classmethod
+    @lru_cache(maxsize=1024)
     def action_planner_prompt(cls, query: str) -> str:
-        return cls.ACTION_PLANNING.format(query=query)
+        # The template embeds a literal JSON schema, so it cannot go through str.format.
+        return cls.ACTION_PLANNING.replace("{query}", query)
 
     @classmethod
     def chat_title_prompt(
@@ -218,23 +288,28 @@ class PromptTemplateService:
         else:
             recent = list(messages)[-limit:]
         if not recent:
-            return cls.CHAT_TITLE.format(transcript="User: Conversation start")
+            return cls.chat_title_prompt_for_transcript("User: Conversation start")
 
         lines: list[str] = []
         for message in recent:
-            role = getattr(message, "role", None) or (
-                message.get("role") if isinstance(message, dict) else "user"
-            )
-            content = getattr(message, "content", None) or (
-                message.get("content") if isinstance(message, dict) else ""
-            )
-            content = str(content).strip()
+            if isinstance(message, dict):
+                role = message.get("role") or "user"
+                content = message.get("content") or ""
+            else:
+                role = getattr(message, "role", None) or "user"
+                content = getattr(message, "content", None) or ""
+            content = (content if isinstance(content, str) else str(content)).strip()
             if not content:
                 continue
-            lines.append(f"{role.capitalize()}: {content}")
+            lines.append(f"{_ROLE_LABELS.get(role) or role.capitalize()}: {content}")
 
         transcript = "\n".join(lines) if lines else "User: Conversation start"
-        return cls.CHAT_TITLE.format(transcript=transcript)
+        return cls.chat_title_prompt_for_transcript(transcript)
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def chat_title_prompt_for_transcript(cls, transcript: str) -> str:
+        return cls._render_chat_title_prompt(transcript=transcript)
 
     @classmethod
     def format_context(
@@ -244,17 +319,21 @@ class PromptTemplateService:
         limit: int = 3,
         max_length: int | None = None,
     ) -> str:
-        sorted_contexts = sorted(contexts, key=lambda item: item.get("score", 0.0), reverse=True)[:limit]
+        # nlargest matches sorted(..., reverse=True)[:limit], ties included, without a full sort.
+        sorted_contexts = heapq.nlargest(limit, contexts, key=lambda item: item.get("score", 0.0))
+        truncate_at = max_length or 0
+        cutoff = truncate_at - 3
         parts: list[str] = []
+        append = parts.append
         for index, ctx in enumerate(sorted_contexts, start=1):
             title = ctx.get("document_title") or ctx.get("source") or "Unknown"
             snippet = ctx.get("text") or ctx.get("content") or ""
-            snippet = str(snippet).strip()
+            snippet = (snippet if isinstance(snippet, str) else str(snippet)).strip()
             if not snippet:
                 continue
-            if max_length and len(snippet) > max_length:
-                snippet = snippet[: max_length - 3].rstrip() + "..."
-            parts.append(f"[Source {index}] {title}\n{snippet}")
+            if truncate_at and len(snippet) > truncate_at:
+                snippet = f"{snippet[:cutoff].rstrip()}..."
+            append(f"[Source {index}] {title}\n{snippet}")
         return "\n\n".join(parts)
 
     @classmethod
@@ -268,19 +347,17 @@ class PromptTemplateService:
         if not conversation:
             return query
 
-        recent_messages = list(conversation)[-limit:]
-        lines: list[str] = ["Previous conversation:"]
-        for message in recent_messages:
-            role = message.get("role", "user")
-            if role == "system":
-                continue
-            content = message.get("content", "").strip()
-            if not content:
-                continue
-            lines.append(f"{role.capitalize()}: {content}")
-
-        if len(lines) == 1:
+        lines = [
+            f"{_ROLE_LABELS.get(role) or role.capitalize()}: {content}"
+            for message in list(conversation)[-limit:]
+            if (role := message.get("role", "user")) != "system"
+            and (content := message.get("content", "").strip())
+        ]
+        if not lines:
             return query
 
         transcript = "\n".join(lines)
-        return f"{transcript}\n\nConsidering the conversation above, answer this follow-up question: {query}"
+        return (
+            f"Previous conversation:\n{transcript}\n\n"
+            f"Considering the conversation above, answer this follow-up question: {query}"
+        )
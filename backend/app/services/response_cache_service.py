@@ -0,0 +1,142 @@
+"""In-process semantic cache for generated RAG answers."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from app.config import settings
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from app.services.embedding_service import EmbeddingService
+    from app.services.llm_service import LLMResponse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    vector: np.ndarray
+    response: LLMResponse
+    expires_at: float
+
+
+class SemanticResponseCache:
+    """Reuses LLM answers for near-duplicate queries answered from the same context.
+
+    Entries are bucketed by an exact hash of everything that shapes the answer besides
+    the query wording (provider, model, prompt, context chunks, history). Within a
+    bucket, a cached answer is served when the cosine similarity between query
+    embeddings reaches ``similarity_threshold``.
+    """
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        *,
+        similarity_threshold: float | None = None,
+        ttl_seconds: int | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        self.embedding_service = embedding_service
+        self.similarity_threshold = (
+            similarity_threshold
+            if similarity_threshold is not None
+            else settings.response_cache_similarity
+        )
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.cache_ttl_seconds
+        self.max_entries = max(1, max_entries or settings.response_cache_max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._buckets: OrderedDict[str, list[_CacheEntry]] = OrderedDict()
+        self._size = 0
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def build_context_key(
+        *,
+        query: str,
+        provider: str,
+        model: str,
+        system_prompt: str | None,
+        temperature: float,
+        max_tokens: int,
+        context_documents: list[dict[str, Any]],
+        conversation_history: list[dict[str, str]] | None,
+    ) -> str:
+        history = list(conversation_history or [])
+        # Callers append the current question to the history; it must not pin the key to exact wording.
+        if history and history[-1].get("role") == "user" and history[-1].get("content") == query:
+            history.pop()
+        material = {
+            "provider": provider,
+            "model": model,
+            "system_prompt": system_prompt or "",
+            "temperature": round(temperature, 3),
+            "max_tokens": max_tokens,
+            "context": [
+                [str(doc.get("chunk_id") or ""), str(doc.get("text") or "")] for doc in context_documents
+            ],
+            "history": [
+                [str(message.get("role", "")), str(message.get("content", ""))]
+                for message in history
+            ],
+        }
+        raw = json.dumps(material, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def embed_query(self, query: str) -> np.ndarray | None:
+        try:
+            embedding = await self.embedding_service.embed_text(query)
+        except Exception as exc:  # pragma: no cover - embedding failures degrade to a miss
+            logger.warning("Response cache embedding failed", extra={"error": str(exc)})
+            return None
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if vector.ndim != 1 or not norm:
+            return None
+        return vector / norm
+
+    async def lookup(self, context_key: str, vector: np.ndarray) -> LLMResponse | None:
+        now = time.monotonic()
+        async with self._lock:
+            bucket = self._buckets.get(context_key)
+            if bucket:
+                live = [entry for entry in bucket if entry.expires_at > now]
+                self._size -= len(bucket) - len(live)
+                if not live:
+                    del self._buckets[context_key]
+                else:
+                    self._buckets[context_key] = live
+                    self._buckets.move_to_end(context_key)
+                    similarities = np.stack([entry.vector for entry in live]) @ vector
+                    best = int(np.argmax(similarities))
+                    if float(similarities[best]) >= self.similarity_threshold:
+                        self.hits += 1
+                        cached = live[best].response
+                        return replace(cached, metadata={**cached.metadata, "cache_hit": True})
+            self.misses += 1
+            return None
+
+    async def store(self, context_key: str, vector: np.ndarray, response: LLMResponse) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        entry = _CacheEntry(vector=vector, response=response, expires_at=time.monotonic() + self.ttl_seconds)
+        async with self._lock:
+            self._buckets.setdefault(context_key, []).append(entry)
+            self._buckets.move_to_end(context_key)
+            self._size += 1
+            while self._size > self.max_entries and self._buckets:
+                _, evicted = self._buckets.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._size = 0
@@ -1,9 +1,16 @@
 """Tenant-aware retrieval orchestrator with caching and reranking."""
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import re
+import unicodedata
 from typing import Any
 
+import orjson
+
+from app.config import settings
 from app.services.cache_service import CacheService
 from app.services.embedding_service import EmbeddingService
 from app.services.rerank_service import RerankService
@@ -11,6 +18,30 @@ from app.services.vector_service import QdrantVectorService, VectorSearchResults
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _canonical_json(value: Any) -> bytes:
+    return orjson.dumps(value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+
+
+async def _discard_task(task: asyncio.Task[Any]) -> None:
+    """Cancel ``task`` if still pending and wait for it without masking our own cancellation."""
+
+    if task.done():
+        if not task.cancelled():
+            task.exception()  # mark any failure as retrieved
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        current = asyncio.current_task()
+        if current is not None and current.cancelling():
+            raise
+    except Exception:
+        pass
+
 
 class RetrievalService:
     """Coordinates embedding, vector search, caching, and optional reranking."""
@@ -50,11 +81,18 @@ class RetrievalService:
             and filters.get("document_id") is None
         ):
             cache_key = self._build_cache_key(tenant_id, query, limit, score_threshold, filters)
-            cache_payload = await self.cache_service.get_json(cache_key)
-            if cache_payload:
-                return VectorSearchResults.from_payload(cache_payload)
-
-        query_embedding = await self.embedding_service.embed_text(query)
+            # Embed speculatively while the result cache is consulted so a miss costs
+            # max(cache RTT, embedding) rather than their sum.
+            embed_task = asyncio.create_task(self._embed_query(query, use_cache=use_cache))
+            try:
+                cache_payload = await self.cache_service.get_json(cache_key)
+                if cache_payload:
+                    return VectorSearchResults.from_payload(cache_payload)
+                query_embedding = await embed_task
+            finally:
+                await _discard_task(embed_task)
+        else:
+            query_embedding = await self._embed_query(query, use_cache=use_cache)
         results = await self.vector_service.search_documents(
             tenant_id=tenant_id,
             query_embedding=query_embedding,
@@ -74,10 +112,28 @@ class RetrievalService:
                 )
 
         if cache_key and self.cache_service:
-            await self.cache_service.set_json(results.to_payload(), cache_key)
+            # Misses are remembered briefly so repeated no-match queries skip embedding and search,
+            # without hiding documents indexed shortly afterwards for long.
+            ttl = None if results.items else settings.negative_cache_ttl_seconds
+            await self.cache_service.set_json(results.to_payload(), cache_key, ttl=ttl)
 
         return results
 
+    async def _embed_query(self, query: str, *, use_cache: bool) -> list[float]:
+        if not use_cache or self.cache_service is None:
+            return await self.embedding_service.embed_text(query)
+
+        # Embeddings depend only on the model and text, so this entry is shared across tenants.
+        model_name = getattr(self.embedding_service, "model_name", "default")
+        digest = hashlib.blake2b(query.strip().encode("utf-8"), digest_size=16).hexdigest()
+        cached = await self.cache_service.get_json("embedding", model_name, digest)
+        if cached and isinstance(cached.get("vector"), list):
+            return cached["vector"]
+
+        vector = await self.embedding_service.embed_text(query)
+        await self.cache_service.set_json({"vector": vector}, "embedding", model_name, digest)
+        return vector
+
     def _build_cache_key(
         self,
         tenant_id: str,
@@ -91,22 +147,29 @@ class RetrievalService:
             [
                 "retrieval",
                 tenant_id,
-                query.strip(),
+                self._query_fingerprint(query),
                 str(limit),
                 f"{score_threshold:.3f}",
                 serialised_filters,
             ]
         )
 
+    @staticmethod
+    def _query_fingerprint(query: str) -> str:
+        # Case, width and spacing variants of a question retrieve the same chunks; fold them together.
+        normalised = _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", query)).strip().casefold()
+        return hashlib.blake2b(normalised.encode("utf-8"), digest_size=12).hexdigest()
+
     def _serialise_filters(self, filters: dict[str, Any]) -> str:
         if not filters:
             return "*"
         normalised: dict[str, Any] = {}
-        for key, value in sorted(filters.items()):
+        for key, value in filters.items():
             if isinstance(value, list):
-                normalised[key] = sorted(str(item) for item in value)
+                normalised[str(key)] = sorted(str(item) for item in value)
             elif isinstance(value, dict):
-                normalised[key] = {k: value[k] for k in sorted(value)}
+                normalised[str(key)] = value
             else:
-                normalised[key] = str(value)
-        return str(normalised)
+                normalised[str(key)] = str(value)
+        # Sorted-key JSON is stable across interpreter versions; the digest keeps keys short.
+        return hashlib.blake2b(_canonical_json(normalised), digest_size=16).hexdigest()
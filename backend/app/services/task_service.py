@@ -1,14 +1,16 @@
 """Services for managing tenant tasks and incidents."""
 from __future__ import annotations
 
+from collections import Counter
+from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import structlog
 from fastapi import HTTPException, status
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Query, Session, selectinload
 
 from app.models.task import (
     Incident,
@@ -19,9 +21,80 @@ from app.models.task import (
     TaskStatus,
 )
 from app.models.tenant import TenantUser
+from app.schemas.task import TaskCreate
 
 logger = structlog.get_logger(__name__)
 
+# Enum member lookups go through the metaclass; bind the stored string values once.
+_TASK_OPEN = TaskStatus.OPEN.value
+_TASK_COMPLETED = TaskStatus.COMPLETED.value
+_INCIDENT_MITIGATED = IncidentStatus.MITIGATED.value
+_INCIDENT_RESOLVED = IncidentStatus.RESOLVED.value
+
+
+def _set_task_status(record: Task, value: Any) -> None:
+    if isinstance(value, TaskStatus):
+        record.status = value.value
+        record.completed_at = datetime.now(UTC) if value == _TASK_COMPLETED else None
+    else:
+        record.status = value
+
+
+def _set_task_priority(record: Task, value: Any) -> None:
+    record.priority = value.value if isinstance(value, TaskPriority) else value
+
+
+def _set_task_metadata(record: Task, value: Any) -> None:
+    record.task_metadata = value
+
+
+def _set_incident_severity(record: Incident, value: Any) -> None:
+    record.severity = value.value if isinstance(value, IncidentSeverity) else value
+
+
+def _set_incident_status(record: Incident, value: Any) -> None:
+    if not isinstance(value, IncidentStatus):
+        record.status = value
+        return
+    record.status = value.value
+    if value == _INCIDENT_MITIGATED and not record.mitigated_at:
+        record.mitigated_at = datetime.now(UTC)
+    if value == _INCIDENT_RESOLVED and not record.resolved_at:
+        record.resolved_at = datetime.now(UTC)
+
+
+def _set_incident_metadata(record: Incident, value: Any) -> None:
+    record.incident_metadata = value
+
+
+# Fields needing more than a plain column assignment; anything else falls back to setattr.
+_TASK_UPDATE_HANDLERS: dict[str, Callable[[Task, Any], None]] = {
+    "status": _set_task_status,
+    "priority": _set_task_priority,
+    "metadata": _set_task_metadata,
+}
+_INCIDENT_UPDATE_HANDLERS: dict[str, Callable[[Incident, Any], None]] = {
+    "severity": _set_incident_severity,
+    "status": _set_incident_status,
+    "metadata": _set_incident_metadata,
+}
+
+
+def _paginate_with_total(query: Query, order_by: Any, skip: int, limit: int) -> tuple[list[Any], int]:
+    """Fetch one page and the filtered total in a single round trip via ``COUNT(*) OVER ()``."""
+    offset = max(skip, 0)
+    rows = (
+        query.add_columns(func.count().over().label("total"))
+        .order_by(order_by)
+        .offset(offset)
+        .limit(max(limit, 1))
+        .all()
+    )
+    if rows:
+        return [row[0] for row in rows], rows[0][1]
+    # A page past the end carries no window count, so only then pay for a separate COUNT.
+    return [], query.count() if offset else 0
+
 
 class TaskService:
     """Encapsulates task CRUD logic with tenant isolation."""
@@ -34,22 +107,19 @@ class TaskService:
         limit: int = 20,
         status_filter: TaskStatus | None = None,
         priority_filter: TaskPriority | None = None,
+        load_people: bool = False,
     ) -> tuple[list[Task], int]:
         query = db.query(Task).filter(Task.tenant_id == tenant_id)
+        if load_people:
+            # One batched IN (...) query per relationship instead of a lazy load per row.
+            query = query.options(selectinload(Task.assigned_to), selectinload(Task.created_by))
 
         if status_filter:
             query = query.filter(Task.status == status_filter.value)
         if priority_filter:
             query = query.filter(Task.priority == priority_filter.value)
 
-        total = query.count()
-        items = (
-            query.order_by(Task.created_at.desc())
-            .offset(max(skip, 0))
-            .limit(max(limit, 1))
-            .all()
-        )
-        return items, total
+        return _paginate_with_total(query, Task.created_at.desc(), skip, limit)
 
     def get_task(self, db: Session, tenant_id: UUID, task_id: UUID) -> Task:
         record = (
@@ -96,7 +166,7 @@ class TaskService:
             tags=tags or [],
             task_metadata=metadata or {},
             due_date=due_date,
-            status=TaskStatus.OPEN.value,
+            status=_TASK_OPEN,
         )
         db.add(record)
         db.commit()
@@ -104,6 +174,56 @@ class TaskService:
         logger.info("Task created", task_id=str(record.id), tenant=str(tenant_id))
         return record
 
+    def create_tasks_bulk(
+        self,
+        db: Session,
+        tenant_id: UUID,
+        creator_id: UUID | None,
+        specs: list[TaskCreate],
+    ) -> list[Task]:
+        """Create several tasks with one assignee check, one commit, and one reload query."""
+        if not specs:
+            return []
+
+        assignee_ids = {spec.assigned_to_id for spec in specs if spec.assigned_to_id}
+        if assignee_ids:
+            found = {
+                row.id
+                for row in db.query(TenantUser.id)
+                .filter(TenantUser.id.in_(assignee_ids), TenantUser.tenant_id == tenant_id)
+                .all()
+            }
+            if found != assignee_ids:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Assigned user not found in tenant",
+                )
+
+        records = [
+            Task(
+                id=uuid4(),
+                tenant_id=tenant_id,
+                created_by_id=creator_id,
+                assigned_to_id=spec.assigned_to_id,
+                title=spec.title,
+                description=spec.description,
+                priority=spec.priority.value,
+                tags=spec.tags,
+                task_metadata=spec.metadata,
+                due_date=spec.due_date,
+                status=_TASK_OPEN,
+            )
+            for spec in specs
+        ]
+        ids = [record.id for record in records]
+        db.add_all(records)
+        db.commit()
+
+        # Commit expires every record; reload them together instead of one SELECT per access.
+        loaded = {task.id: task for task in db.query(Task).filter(Task.id.in_(ids)).all()}
+        logger.info("Tasks created", count=len(records), tenant=str(tenant_id))
+        return [loaded[task_id] for task_id in ids]
+
     def update_task(
         self,
         db: Session,
@@ -133,15 +253,9 @@ class TaskService:
 
             if value is None:
                 continue
-            if field == "status" and isinstance(value, TaskStatus):
-                setattr(record, field, value.value)
-                record.completed_at = datetime.now(UTC) if value == TaskStatus.COMPLETED else None
-            elif field == "priority" and isinstance(value, TaskPriority):
-                setattr(record, field, value.value)
-            elif field == "metadata":
-                record.task_metadata = value
-            elif field == "tags":
-                record.tags = value
+            handler = _TASK_UPDATE_HANDLERS.get(field)
+            if handler is not None:
+                handler(record, value)
             elif hasattr(record, field):
                 setattr(record, field, value)
 
@@ -162,22 +276,18 @@ class IncidentService:
         limit: int = 20,
         severity_filter: IncidentSeverity | None = None,
         status_filter: IncidentStatus | None = None,
+        load_people: bool = False,
     ) -> tuple[list[Incident], int]:
         query = db.query(Incident).filter(Incident.tenant_id == tenant_id)
+        if load_people:
+            query = query.options(selectinload(Incident.reported_by))
 
         if severity_filter:
             query = query.filter(Incident.severity == severity_filter.value)
         if status_filter:
             query = query.filter(Incident.status == status_filter.value)
 
-        total = query.count()
-        items = (
-            query.order_by(Incident.detected_at.desc())
-            .offset(max(skip, 0))
-            .limit(max(limit, 1))
-            .all()
-        )
-        return items, total
+        return _paginate_with_total(query, Incident.detected_at.desc(), skip, limit)
 
     def get_incident(self, db: Session, tenant_id: UUID, incident_id: UUID) -> Incident:
         record = (
@@ -233,18 +343,9 @@ class IncidentService:
         for field, value in updates.items():
             if value is None:
                 continue
-            if field == "severity" and isinstance(value, IncidentSeverity):
-                setattr(record, field, value.value)
-            elif field == "status" and isinstance(value, IncidentStatus):
-                setattr(record, field, value.value)
-                if value == IncidentStatus.MITIGATED and not record.mitigated_at:
-                    record.mitigated_at = datetime.now(UTC)
-                if value == IncidentStatus.RESOLVED and not record.resolved_at:
-                    record.resolved_at = datetime.now(UTC)
-            elif field == "metadata":
-                record.incident_metadata = value
-            elif field in {"tags", "impacted_systems"}:
-                setattr(record, field, value)
+            handler = _INCIDENT_UPDATE_HANDLERS.get(field)
+            if handler is not None:
+                handler(record, value)
             elif hasattr(record, field):
                 setattr(record, field, value)
 
@@ -258,7 +359,7 @@ class IncidentService:
 
         resolved = updates.get("resolved")
         if resolved:
-            record.status = IncidentStatus.RESOLVED.value
+            record.status = _INCIDENT_RESOLVED
             record.resolved_at = record.resolved_at or datetime.now(UTC)
 
         db.commit()
@@ -274,32 +375,37 @@ class IncidentService:
     ) -> dict[str, Any]:
         cutoff = datetime.now(UTC) - timedelta(days=max(timeframe_days, 1))
 
-        incidents = (
+        in_window = and_(Incident.tenant_id == tenant_id, Incident.detected_at >= cutoff)
+
+        # Aggregate in the database so only one row per severity/status pair is transferred.
+        grouped = (
+            db.query(Incident.severity, Incident.status, func.count(Incident.id))
+            .filter(in_window)
+            .group_by(Incident.severity, Incident.status)
+            .all()
+        )
+        totals_by_severity: Counter[str] = Counter()
+        totals_by_status: Counter[str] = Counter()
+        for severity, status_value, count in grouped:
+            totals_by_severity[severity] += count
+            totals_by_status[status_value] += count
+
+        total_incidents = sum(totals_by_status.values())
+        resolved_count = totals_by_status.get(_INCIDENT_RESOLVED, 0)
+        recent_incidents = (
             db.query(Incident)
-            .filter(and_(Incident.tenant_id == tenant_id, Incident.detected_at >= cutoff))
+            .filter(in_window)
             .order_by(Incident.detected_at.desc())
+            .limit(10)
             .all()
         )
 
-        totals_by_severity: dict[str, int] = {}
-        totals_by_status: dict[str, int] = {}
-        open_count = 0
-        resolved_count = 0
-
-        for incident in incidents:
-            totals_by_severity[incident.severity] = totals_by_severity.get(incident.severity, 0) + 1
-            totals_by_status[incident.status] = totals_by_status.get(incident.status, 0) + 1
-            if incident.status != IncidentStatus.RESOLVED.value:
-                open_count += 1
-            else:
-                resolved_count += 1
-
         return {
             "timeframe_days": timeframe_days,
-            "total_incidents": len(incidents),
-            "open_incidents": open_count,
+            "total_incidents": total_incidents,
+            "open_incidents": total_incidents - resolved_count,
             "resolved_incidents": resolved_count,
-            "incidents_by_severity": totals_by_severity,
-            "incidents_by_status": totals_by_status,
-            "recent_incidents": incidents[:10],
+            "incidents_by_severity": dict(totals_by_severity),
+            "incidents_by_status": dict(totals_by_status),
+            "recent_incidents": recent_incidents,
         }
@@ -1,18 +1,100 @@
 """Tenant management service."""
+import time
 import uuid
+from collections.abc import Collection
+from datetime import datetime
 from typing import Any
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, func, inspect, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from app.config import settings
 from app.models.document import Document
 from app.models.tenant import Tenant, TenantUser
 
+_TENANT_MAPPER = inspect(Tenant)
+_TENANT_COLUMNS = tuple(attr.key for attr in _TENANT_MAPPER.column_attrs)
+_TENANT_CACHE_MAX_ENTRIES = 10_000
+_CONFLICT_AWARE_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+_UPDATABLE_TENANT_FIELDS = frozenset(
+    {
+        "name",
+        "subdomain",
+        "llm_provider",
+        "llm_model",
+        "embedding_model",
+        "max_documents",
+        "max_queries_per_day",
+    }
+)
+
+
+def _looks_like_uuid(identifier: str) -> bool:
+    """Cheap shape check so subdomain lookups skip the exception path of ``uuid.UUID``."""
+
+    if len(identifier) == 32:
+        return True
+    return (
+        len(identifier) == 36
+        and identifier[8] == "-"
+        and identifier[13] == "-"
+        and identifier[18] == "-"
+        and identifier[23] == "-"
+    )
+
 
 class TenantService:
     """Business logic for tenant lifecycle and isolation."""
 
+    def __init__(self, *, cache_ttl_seconds: int | None = None) -> None:
+        self.cache_ttl_seconds = (
+            cache_ttl_seconds if cache_ttl_seconds is not None else settings.tenant_cache_ttl_seconds
+        )
+        # (kind, value) -> (expires_at, column snapshot) for active tenants.
+        self._tenant_cache: dict[tuple[str, Any], tuple[float, dict[str, Any]]] = {}
+
+    def _remember(self, tenant: Tenant) -> None:
+        if self.cache_ttl_seconds <= 0:
+            return
+        if len(self._tenant_cache) >= _TENANT_CACHE_MAX_ENTRIES:
+            self._tenant_cache.clear()
+        snapshot = {key: getattr(tenant, key) for key in _TENANT_COLUMNS}
+        entry = (time.monotonic() + self.cache_ttl_seconds, snapshot)
+        self._tenant_cache[("id", tenant.id)] = entry
+        if tenant.subdomain:
+            self._tenant_cache[("subdomain", tenant.subdomain)] = entry
+
+    def _recall(self, db: Session, key: tuple[str, Any]) -> Tenant | None:
+        entry = self._tenant_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, snapshot = entry
+        if expires_at <= time.monotonic():
+            self._tenant_cache.pop(key, None)
+            return None
+        # The session's own instance wins so unflushed edits are never overwritten by the snapshot.
+        existing = db.identity_map.get(_TENANT_MAPPER.identity_key_from_primary_key((snapshot["id"],)))
+        if existing is not None:
+            return existing
+        # Otherwise rebuild a detached copy and attach it without SQL.
+        tenant = Tenant(**snapshot)
+        make_transient_to_detached(tenant)
+        db.add(tenant)
+        return tenant
+
+    def _forget(self, tenant: Tenant) -> None:
+        self._tenant_cache.pop(("id", tenant.id), None)
+        stale_subdomains = [
+            key
+            for key, (_, snapshot) in self._tenant_cache.items()
+            if key[0] == "subdomain" and snapshot["id"] == tenant.id
+        ]
+        for key in stale_subdomains:
+            self._tenant_cache.pop(key, None)
+
     def create_tenant(
         self,
         db: Session,
@@ -21,51 +103,81 @@ class TenantService:
         llm_provider: str = "openai",
         llm_model: str = "gpt-4o-mini",
     ) -> Tenant:
-        if subdomain:
-            existing = db.query(Tenant).filter(Tenant.subdomain == subdomain).first()
-            if existing:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Subdomain already exists",
-                )
+        values = {
+            "name": name,
+            "subdomain": subdomain,
+            "llm_provider": llm_provider,
+            "llm_model": llm_model,
+            "is_active": True,
+        }
+        insert_for_dialect = _CONFLICT_AWARE_INSERTS.get(db.get_bind().dialect.name)
+        if insert_for_dialect is not None:
+            # The unique index on subdomain arbitrates races; no pre-check SELECT is needed.
+            tenant = db.execute(
+                insert_for_dialect(Tenant)
+                .values(**values)
+                .on_conflict_do_nothing(index_elements=[Tenant.subdomain])
+                .returning(Tenant)
+            ).scalar_one_or_none()
+        else:
+            tenant = Tenant(**values)
+            try:
+                # A savepoint confines the failed INSERT; the caller's pending work survives.
+                with db.begin_nested():
+                    db.add(tenant)
+                    db.flush()
+            except IntegrityError:
+                if subdomain is None or not self._subdomain_taken(db, subdomain):
+                    raise
+                tenant = None
 
-        tenant = Tenant(
-            name=name,
-            subdomain=subdomain,
-            llm_provider=llm_provider,
-            llm_model=llm_model,
-            is_active=True,
-        )
-        db.add(tenant)
+        if tenant is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Subdomain already exists",
+            )
         db.commit()
         db.refresh(tenant)
         return tenant
 
-    def get_tenant_by_id(self, db: Session, tenant_id: str) -> Tenant | None:
-        try:
-            resolved_tenant_id = tenant_id if isinstance(tenant_id, uuid.UUID) else uuid.UUID(str(tenant_id))
-        except (ValueError, TypeError):
-            return None
+    @staticmethod
+    def _subdomain_taken(db: Session, subdomain: str) -> bool:
+        return db.query(Tenant.id).filter(Tenant.subdomain == subdomain).first() is not None
 
-        return (
+    def get_tenant_by_id(self, db: Session, tenant_id: uuid.UUID) -> Tenant | None:
+        cached = self._recall(db, ("id", tenant_id))
+        if cached is not None:
+            return cached
+        tenant = (
             db.query(Tenant)
-            .filter(and_(Tenant.id == resolved_tenant_id, Tenant.is_active.is_(True)))
+            .filter(and_(Tenant.id == tenant_id, Tenant.is_active.is_(True)))
             .first()
         )
+        if tenant is not None:
+            self._remember(tenant)
+        return tenant
 
     def get_tenant_by_subdomain(self, db: Session, subdomain: str) -> Tenant | None:
-        return (
+        cached = self._recall(db, ("subdomain", subdomain))
+        if cached is not None:
+            return cached
+        tenant = (
             db.query(Tenant)
             .filter(and_(Tenant.subdomain == subdomain, Tenant.is_active.is_(True)))
             .first()
         )
+        if tenant is not None:
+            self._remember(tenant)
+        return tenant
 
     def get_tenant_by_identifier(self, db: Session, identifier: str) -> Tenant | None:
+        if not _looks_like_uuid(identifier):
+            return self.get_tenant_by_subdomain(db, identifier)
         try:
             tenant_uuid = uuid.UUID(identifier)
-            return self.get_tenant_by_id(db, str(tenant_uuid))
         except ValueError:
             return self.get_tenant_by_subdomain(db, identifier)
+        return self.get_tenant_by_id(db, tenant_uuid)
 
     def list_tenants(
         self,
@@ -73,48 +185,69 @@ class TenantService:
         skip: int = 0,
         limit: int = 100,
         active_only: bool = True,
+        after: tuple[datetime, uuid.UUID] | None = None,
     ) -> list[Tenant]:
+        """Newest tenants first; pass the last row's ``(created_at, id)`` as ``after`` for the next page."""
+
         query = db.query(Tenant)
         if active_only:
             query = query.filter(Tenant.is_active.is_(True))
-        return query.offset(skip).limit(limit).all()
+        if after is not None:
+            # Keyset pagination: an index range scan instead of reading and discarding `skip` rows.
+            after_created_at, after_id = after
+            query = query.filter(
+                or_(
+                    Tenant.created_at < after_created_at,
+                    and_(Tenant.created_at == after_created_at, Tenant.id < after_id),
+                )
+            )
+        query = query.order_by(Tenant.created_at.desc(), Tenant.id.desc())
+        if after is None:
+            query = query.offset(skip)
+        return query.limit(limit).all()
 
-    def update_tenant(self, db: Session, tenant_id: str, updates: dict[str, Any]) -> Tenant:
-        tenant = self.get_tenant_by_id(db, tenant_id)
-        if not tenant:
+    def update_tenant(self, db: Session, tenant_id: uuid.UUID, updates: dict[str, Any]) -> Tenant:
+        filtered = {field: value for field, value in updates.items() if field in _UPDATABLE_TENANT_FIELDS}
+        if not filtered:
+            tenant = self.get_tenant_by_id(db, tenant_id)
+            if not tenant:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Tenant not found",
+                )
+            return tenant
+
+        # One UPDATE ... RETURNING replaces the load-then-flush round trips; the returned row
+        # also refreshes any copy already in the identity map.
+        tenant = db.execute(
+            update(Tenant)
+            .where(and_(Tenant.id == tenant_id, Tenant.is_active.is_(True)))
+            .values(**filtered)
+            .returning(Tenant),
+            execution_options={"synchronize_session": False},
+        ).scalar_one_or_none()
+        if tenant is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Tenant not found",
             )
 
-        allowed_fields = {
-            "name",
-            "subdomain",
-            "llm_provider",
-            "llm_model",
-            "embedding_model",
-            "max_documents",
-            "max_queries_per_day",
-        }
-
-        for field, value in updates.items():
-            if field in allowed_fields and hasattr(tenant, field):
-                setattr(tenant, field, value)
-
         db.commit()
+        self._forget(tenant)
         db.refresh(tenant)
         return tenant
 
-    def deactivate_tenant(self, db: Session, tenant_id: str) -> bool:
+    def deactivate_tenant(self, db: Session, tenant_id: uuid.UUID) -> bool:
         tenant = self.get_tenant_by_id(db, tenant_id)
         if not tenant:
             return False
 
         tenant.is_active = False
         db.commit()
+        self._forget(tenant)
         return True
 
-    def get_tenant_stats(self, db: Session, tenant_id: str) -> dict[str, Any]:
+    def get_tenant_stats(self, db: Session, tenant_id: uuid.UUID) -> dict[str, Any]:
         tenant = self.get_tenant_by_id(db, tenant_id)
         if not tenant:
             raise HTTPException(
@@ -122,16 +255,21 @@ class TenantService:
                 detail="Tenant not found",
             )
 
-        user_count = (
-            db.query(TenantUser)
-            .filter(and_(TenantUser.tenant_id == tenant_id, TenantUser.is_active.is_(True)))
-            .count()
+        # All three counters come back in one round trip: users via a scalar subquery and
+        # documents via conditional aggregation over a single scan.
+        active_users = (
+            select(func.count(TenantUser.id))
+            .where(and_(TenantUser.tenant_id == tenant_id, TenantUser.is_active.is_(True)))
+            .scalar_subquery()
         )
-        document_count = db.query(Document).filter(Document.tenant_id == tenant_id).count()
-        processed_count = (
-            db.query(Document)
-            .filter(and_(Document.tenant_id == tenant_id, Document.status == "processed"))
-            .count()
+        user_count, document_count, processed_count = (
+            db.query(
+                active_users,
+                func.count(Document.id),
+                func.coalesce(func.sum(case((Document.status == "processed", 1), else_=0)), 0),
+            )
+            .filter(Document.tenant_id == tenant_id)
+            .one()
         )
 
         return {
@@ -151,10 +289,46 @@ class TenantService:
             },
         }
 
+    def get_tenants_stats_bulk(
+        self, db: Session, tenant_ids: Collection[uuid.UUID]
+    ) -> dict[uuid.UUID, dict[str, int]]:
+        """Usage counters for many tenants with one GROUP BY per table instead of N stats calls."""
+
+        stats = {
+            tenant_id: {"user_count": 0, "document_count": 0, "processed_document_count": 0}
+            for tenant_id in tenant_ids
+        }
+        if not stats:
+            return stats
+
+        document_rows = (
+            db.query(
+                Document.tenant_id,
+                func.count(Document.id),
+                func.coalesce(func.sum(case((Document.status == "processed", 1), else_=0)), 0),
+            )
+            .filter(Document.tenant_id.in_(stats))
+            .group_by(Document.tenant_id)
+            .all()
+        )
+        for tenant_id, document_count, processed_count in document_rows:
+            stats[tenant_id]["document_count"] = document_count
+            stats[tenant_id]["processed_document_count"] = processed_count
+
+        user_rows = (
+            db.query(TenantUser.tenant_id, func.count(TenantUser.id))
+            .filter(and_(TenantUser.tenant_id.in_(stats), TenantUser.is_active.is_(True)))
+            .group_by(TenantUser.tenant_id)
+            .all()
+        )
+        for tenant_id, user_count in user_rows:
+            stats[tenant_id]["user_count"] = user_count
+        return stats
+
     def validate_tenant_quota(
         self,
         db: Session,
-        tenant_id: str,
+        tenant_id: uuid.UUID,
         quota_type: str,
         current_count: int | None = None,
     ) -> bool:
@@ -163,10 +337,20 @@ class TenantService:
             return False
 
         if quota_type == "documents":
-            count = current_count
-            if count is None:
-                count = db.query(Document).filter(Document.tenant_id == tenant_id).count()
-            return count < tenant.max_documents
+            if current_count is not None:
+                return current_count < tenant.max_documents
+            if tenant.max_documents <= 0:
+                return False
+            # Probe for the max_documents-th row instead of counting them all; the scan
+            # stops as soon as the limit is known to be reached.
+            at_limit = (
+                db.query(Document.id)
+                .filter(Document.tenant_id == tenant_id)
+                .offset(tenant.max_documents - 1)
+                .limit(1)
+                .first()
+            )
+            return at_limit is None
 
         return True
 
@@ -1,12 +1,17 @@
 """Qdrant vector store integration with tenant isolation."""
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Collection
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
-from uuid import uuid4
+from uuid import UUID, uuid4, uuid5
 
-from qdrant_client import AsyncQdrantClient, QdrantClient
+import numpy as np
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models
 from qdrant_client.http.models import (
     Distance,
@@ -23,6 +28,45 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Namespace for deterministic point ids; changing it would orphan every stored vector.
+POINT_ID_NAMESPACE = UUID("0f5a3887-fccc-4d58-b143-ebf8c00f521a")
+
+_SEARCH_EXCLUDED_METADATA = frozenset({"text", "tenant_id", "document_id", "chunk_id", "source", "chunk_index"})
+_SEARCH_CORE_FIELDS = ("text", "document_id", "chunk_id", "source", "page_number", "chunk_index")
+_SEARCH_PAYLOAD_SELECTOR = models.PayloadSelectorExclude(exclude=["tenant_id"])
+
+
+def _build_client_kwargs() -> dict[str, Any]:
+    """Construct client keyword arguments supporting host or full URL values."""
+
+    host_value = (settings.qdrant_host or "").strip()
+    kwargs: dict[str, Any] = {
+        "api_key": settings.qdrant_api_key,
+        "timeout": 30.0,
+        "prefer_grpc": False,
+        "check_compatibility": False,
+    }
+
+    if host_value.startswith("http://") or host_value.startswith("https://"):
+        kwargs["url"] = host_value.rstrip("/")
+    else:
+        kwargs["host"] = host_value or "localhost"
+        kwargs["port"] = settings.qdrant_port
+        kwargs["https"] = False
+
+    return kwargs
+
+
+# Settings are fixed for the process lifetime, so the host/URL parsing happens once at import.
+_QDRANT_CLIENT_KWARGS = MappingProxyType(_build_client_kwargs())
+
+
+@lru_cache(maxsize=1)
+def _shared_async_client() -> AsyncQdrantClient:
+    """One client (and connection pool) per process, however many services are built."""
+
+    return AsyncQdrantClient(**_QDRANT_CLIENT_KWARGS)
+
 
 @dataclass
 class VectorSearchResults:
@@ -54,31 +98,7 @@ class QdrantVectorService:
     def __init__(self) -> None:
         self.default_collection = "multi_tenant_documents"
         self.embedding_dimension = settings.embedding_dimension
-
-        common_kwargs = self._build_client_kwargs()
-
-        self.client = QdrantClient(**common_kwargs)
-        self.async_client = AsyncQdrantClient(**common_kwargs)
-
-    def _build_client_kwargs(self) -> dict[str, Any]:
-        """Construct client keyword arguments supporting host or full URL values."""
-
-        host_value = (settings.qdrant_host or "").strip()
-        kwargs: dict[str, Any] = {
-            "api_key": settings.qdrant_api_key,
-            "timeout": 30.0,
-            "prefer_grpc": False,
-            "check_compatibility": False,
-        }
-
-        if host_value.startswith("http://") or host_value.startswith("https://"):
-            kwargs["url"] = host_value.rstrip("/")
-        else:
-            kwargs["host"] = host_value or "localhost"
-            kwargs["port"] = settings.qdrant_port
-            kwargs["https"] = False
-
-        return kwargs
+        self.async_client = _shared_async_client()
 
     async def init_collection(self, collection_name: str | None = None) -> bool:
         collection = collection_name or self.default_collection
@@ -120,42 +140,93 @@ class QdrantVectorService:
         tenant_id: str,
         documents: list[dict[str, Any]],
         collection_name: str | None = None,
+        *,
+        embeddings: np.ndarray | None = None,
     ) -> bool:
+        """Upsert chunk payloads; vectors come from ``embeddings`` rows or each document's ``embedding``."""
+
         collection = collection_name or self.default_collection
         if not documents:
             return True
 
-        points: list[PointStruct] = []
-        for doc in documents:
-            payload = dict(doc.get("metadata", {}))
-            payload.update(
-                {
-                    "tenant_id": tenant_id,
-                    "document_id": doc.get("document_id"),
-                    "chunk_id": doc.get("chunk_id"),
-                    "text": doc.get("text", ""),
-                    "source": doc.get("source", ""),
-                    "page_number": doc.get("page_number"),
-                    "chunk_index": doc.get("chunk_index", 0),
-                    "tags": doc.get("tags", []),
-                }
-            )
-            if doc.get("document_type"):
-                payload["document_type"] = doc["document_type"]
-            if doc.get("created_at"):
-                payload["created_at"] = doc["created_at"]
-            if doc.get("created_at_ts") is not None:
-                payload["created_at_ts"] = doc["created_at_ts"]
-            points.append(PointStruct(id=str(uuid4()), vector=doc["embedding"], payload=payload))
+        try:
+            source = embeddings if embeddings is not None else [doc["embedding"] for doc in documents]
+            matrix = np.ascontiguousarray(source, dtype=np.float32)
+            if matrix.ndim != 2 or matrix.shape[0] != len(documents):
+                raise ValueError(f"expected {len(documents)} embedding rows, got shape {matrix.shape}")
+        except (KeyError, TypeError, ValueError) as exc:
+            logger.error("Invalid embeddings for upsert", extra={"error": str(exc)})
+            return False
+
+        batch_size = max(1, settings.qdrant_upsert_batch_size)
+        semaphore = asyncio.Semaphore(max(1, settings.qdrant_upsert_concurrency))
+
+        async def upsert_batch(start: int) -> None:
+            # Points are built only once a slot is free, so at most `concurrency` batches are held in memory.
+            async with semaphore:
+                stop = start + batch_size
+                # One C-level conversion per batch; the client's JSON encoder only takes Python floats.
+                vectors = matrix[start:stop].tolist()
+                points = self._build_points(tenant_id, documents[start:stop], vectors)
+                await self.async_client.upsert(collection_name=collection, points=points)
 
         try:
-            await self.async_client.upsert(collection_name=collection, points=points)
-            logger.info("Stored document chunks in Qdrant", extra={"count": len(points), "tenant": tenant_id})
+            await asyncio.gather(*(upsert_batch(start) for start in range(0, len(documents), batch_size)))
+            logger.info("Stored document chunks in Qdrant", extra={"count": len(documents), "tenant": tenant_id})
             return True
         except Exception as exc:
             logger.error("Failed to upsert vectors", extra={"error": str(exc)})
             return False
 
+    @staticmethod
+    def point_id(tenant_id: str, document_id: Any, chunk_key: Any) -> str:
+        """Stable point id so a retried upsert overwrites the same chunk instead of duplicating it."""
+
+        if document_id is None or chunk_key is None:
+            return str(uuid4())
+        return str(uuid5(POINT_ID_NAMESPACE, f"{tenant_id}:{document_id}:{chunk_key}"))
+
+    @classmethod
+    def _build_points(
+        cls,
+        tenant_id: str,
+        documents: list[dict[str, Any]],
+        vectors: list[list[float]],
+    ) -> list[PointStruct]:
+        if len(documents) != len(vectors):
+            raise ValueError("documents and vectors must be the same length")
+        point_struct = PointStruct
+        point_id = cls.point_id
+        points: list[PointStruct | None] = [None] * len(documents)
+        for index, doc in enumerate(documents):
+            get = doc.get
+            document_id = get("document_id")
+            chunk_id = get("chunk_id")
+            chunk_index = get("chunk_index", 0)
+            payload = {
+                **(get("metadata") or {}),
+                "tenant_id": tenant_id,
+                "document_id": document_id,
+                "chunk_id": chunk_id,
+                "text": get("text", ""),
+                "source": get("source", ""),
+                "page_number": get("page_number"),
+                "chunk_index": chunk_index,
+                "tags": get("tags", []),
+            }
+            if document_type := get("document_type"):
+                payload["document_type"] = document_type
+            if created_at := get("created_at"):
+                payload["created_at"] = created_at
+            if (created_at_ts := get("created_at_ts")) is not None:
+                payload["created_at_ts"] = created_at_ts
+            points[index] = point_struct(
+                id=point_id(tenant_id, document_id, chunk_id or get("chunk_index")),
+                vector=vectors[index],
+                payload=payload,
+            )
+        return points  # type: ignore[return-value]
+
     async def search_documents(
         self,
         tenant_id: str,
@@ -165,8 +236,21 @@ class QdrantVectorService:
         filter_conditions: dict[str, Any] | None = None,
         collection_name: str | None = None,
         offset: int = 0,
+        payload_fields: Collection[str] | None = None,
     ) -> VectorSearchResults:
+        """Search within a tenant.
+
+        By default every payload field except ``tenant_id`` comes back as hit metadata. Callers
+        that only need the core chunk fields can pass ``payload_fields`` (extra metadata keys,
+        possibly empty) so Qdrant projects the payload server-side.
+        """
+
         collection = collection_name or self.default_collection
+        if payload_fields is None:
+            payload_selector = _SEARCH_PAYLOAD_SELECTOR
+        else:
+            extra_fields = [field for field in payload_fields if field not in _SEARCH_CORE_FIELDS]
+            payload_selector = models.PayloadSelectorInclude(include=[*_SEARCH_CORE_FIELDS, *extra_fields])
 
         conditions = [FieldCondition(key="tenant_id", match=MatchValue(value=tenant_id))]
         if filter_conditions:
@@ -200,13 +284,17 @@ class QdrantVectorService:
                 limit=fetch_limit,
                 offset=start_offset,
                 score_threshold=score_threshold,
-                with_payload=True,
+                # tenant_id is implied by the filter, so the server need not send it back per hit.
+                with_payload=payload_selector,
                 with_vectors=False,
             )
 
             formatted: list[dict[str, Any]] = []
             for item in results[:page_size]:
                 payload = item.payload or {}
+                metadata = dict(payload)
+                for key in _SEARCH_EXCLUDED_METADATA:
+                    metadata.pop(key, None)
                 formatted.append(
                     {
                         "id": item.id,
@@ -217,19 +305,7 @@ class QdrantVectorService:
                         "source": payload.get("source", ""),
                         "page_number": payload.get("page_number"),
                         "chunk_index": payload.get("chunk_index", 0),
-                        "metadata": {
-                            k: v
-                            for k, v in payload.items()
-                            if k
-                            not in {
-                                "text",
-                                "tenant_id",
-                                "document_id",
-                                "chunk_id",
-                                "source",
-                                "chunk_index",
-                            }
-                        },
+                        "metadata": metadata,
                     }
                 )
             has_more = len(results) > page_size
@@ -1,21 +1,16 @@
 """Pytest fixtures for backend tests."""
 import os
 import sys
-from collections.abc import Iterator
+import uuid
+from collections.abc import AsyncIterator, Iterator
 from pathlib import Path
 from unittest.mock import AsyncMock
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.ext.compiler import compiles
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
-
-@compiles(JSONB, "sqlite")
-def _compile_jsonb(element, compiler, **kw):
-    return "JSON"
-
 BACKEND_ROOT = Path(__file__).resolve().parents[1]
 if str(BACKEND_ROOT) not in sys.path:
     sys.path.insert(0, str(BACKEND_ROOT))
@@ -26,23 +21,102 @@ os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
 os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
 os.environ.setdefault("DEFAULT_LLM_PROVIDER", "fallback")
 
+# Under pytest-xdist every worker is its own process: the in-memory default is already private,
+# but a file-backed SQLite override needs one file per worker and PostgreSQL one schema per worker.
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+_WORKER_SCHEMA: str | None = None
+if _XDIST_WORKER:
+    _url = os.environ["DATABASE_URL"]
+    if _url.startswith("sqlite") and ":memory:" not in _url:
+        os.environ["DATABASE_URL"] = f"{_url}.{_XDIST_WORKER}"
+    elif _url.startswith("postgresql"):
+        _WORKER_SCHEMA = f"test_{_XDIST_WORKER}"
+        _separator = "&" if "?" in _url else "?"
+        os.environ["DATABASE_URL"] = f"{_url}{_separator}options=-csearch_path%3D{_WORKER_SCHEMA}"
+
 from app.database.base import Base  # noqa: E402
 from app.database.session import SessionLocal, engine  # noqa: E402
 
 # Import models so metadata is populated for table creation.
 from app.models import conversation, document, query, task, tenant  # noqa: F401,E402
+from app.models.tenant import Tenant, TenantUser  # noqa: E402
+
+if engine.dialect.name == "sqlite" and engine.url.database not in (None, "", ":memory:"):
+
+    @event.listens_for(engine, "connect")
+    def _skip_sqlite_fsync(dbapi_connection, _connection_record) -> None:
+        # A file-backed test database is throwaway: keep the journal in memory and skip fsync on commit.
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.close()
 
 
-def _reset_database() -> None:
+@pytest.fixture(scope="module")
+async def _shared_anyio_runner(anyio_backend) -> AsyncIterator[None]:
+    # An open async fixture holds anyio's test runner, so every asyncio test in the module
+    # runs on one event loop instead of building and tearing down a loop per test.
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _reuse_event_loop(request: pytest.FixtureRequest) -> None:
+    if not request.node.get_closest_marker("anyio") or "anyio_backend" not in request.fixturenames:
+        return
+    # Only asyncio has a loop worth keeping; trio runs stay per test.
+    if request.getfixturevalue("anyio_backend") == "asyncio":
+        request.getfixturevalue("_shared_anyio_runner")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _database_schema() -> Iterator[None]:
+    if _WORKER_SCHEMA:
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f'CREATE SCHEMA IF NOT EXISTS "{_WORKER_SCHEMA}"')
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+_SEED_TENANT = {"id": uuid.uuid4(), "name": "Test Tenant", "subdomain": "test-tenant", "is_active": True}
+_SEED_USER = {
+    "id": uuid.uuid4(),
+    "tenant_id": _SEED_TENANT["id"],
+    "email": "seed-user@example.com",
+    "username": "tester",
+    "hashed_password": "hashed",
+    "is_active": True,
+}
+
+
+@pytest.fixture(scope="session")
+def _seeded_tenant_user(_database_schema: None) -> tuple[uuid.UUID, uuid.UUID]:
+    with SessionLocal() as session:
+        session.add_all([Tenant(**_SEED_TENANT), TenantUser(**_SEED_USER)])
+        session.commit()
+    return _SEED_TENANT["id"], _SEED_USER["id"]
 
 
 @pytest.fixture(autouse=True)
-def _prepare_database() -> Iterator[None]:
-    _reset_database()
+def _prepare_database(_seeded_tenant_user: tuple[uuid.UUID, uuid.UUID]) -> Iterator[None]:
+    # The schema and the shared tenant/user are created once per session; each test only
+    # empties the tables afterwards and resets the seeded rows in case a test touched them.
     yield
-    _reset_database()
+    tenants, tenant_users = Tenant.__table__, TenantUser.__table__
+    other_tables = [table for table in Base.metadata.sorted_tables if table not in (tenants, tenant_users)]
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            # One TRUNCATE for everything that has no seeded rows; no CASCADE so the seeds survive.
+            names = ", ".join(connection.dialect.identifier_preparer.format_table(t) for t in other_tables)
+            connection.exec_driver_sql(f"TRUNCATE {names} RESTART IDENTITY")
+        else:
+            for table in reversed(other_tables):
+                connection.execute(table.delete())
+        connection.execute(tenant_users.delete().where(tenant_users.c.id != _SEED_USER["id"]))
+        connection.execute(tenants.delete().where(tenants.c.id != _SEED_TENANT["id"]))
+        connection.execute(tenants.update().where(tenants.c.id == _SEED_TENANT["id"]).values(**_SEED_TENANT))
+        connection.execute(tenant_users.update().where(tenant_users.c.id == _SEED_USER["id"]).values(**_SEED_USER))
 
 
 @pytest.fixture
@@ -55,13 +129,32 @@ def db_session() -> Iterator[Session]:
 
 
 @pytest.fixture
-def client(monkeypatch) -> Iterator[TestClient]:
+def tenant_and_user(db_session: Session) -> tuple[Tenant, TenantUser]:
+    """The session-wide seeded tenant and its user, loaded into this test's session."""
+    return db_session.get(Tenant, _SEED_TENANT["id"]), db_session.get(TenantUser, _SEED_USER["id"])
+
+
+@pytest.fixture(scope="session")
+def _session_client(_database_schema: None) -> Iterator[TestClient]:
     from app.services.vector_service import QdrantVectorService
 
-    monkeypatch.setattr(QdrantVectorService, "init_collection", AsyncMock(return_value=True))
-    monkeypatch.setattr(QdrantVectorService, "health_check", AsyncMock(return_value=True))
+    # App startup and the vector store stubs are the same for every test, so pay for them once.
+    with pytest.MonkeyPatch.context() as patcher:
+        patcher.setattr(QdrantVectorService, "init_collection", AsyncMock(return_value=True))
+        patcher.setattr(QdrantVectorService, "health_check", AsyncMock(return_value=True))
+
+        from app.main import app
 
-    from app.main import app
+        with TestClient(app) as test_client:
+            yield test_client
 
-    with TestClient(app) as test_client:
-        yield test_client
+
+@pytest.fixture
+def client(_session_client: TestClient) -> Iterator[TestClient]:
+    from app.dependencies import get_tenant_service
+
+    yield _session_client
+    _session_client.app.dependency_overrides.clear()
+    _session_client.cookies.clear()
+    # The app's tenant service outlives each test, but _prepare_database deletes the tenant rows.
+    get_tenant_service()._tenant_cache.clear()
@@ -0,0 +1,22 @@
+"""Bulk row seeding helpers for tests."""
+from __future__ import annotations
+
+import uuid
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+
+def seed_rows(
+    db: Session, model: type, rows: list[dict[str, Any]], *, commit: bool = True
+) -> list[uuid.UUID]:
+    """Insert ``rows`` with one executemany; returns the primary keys in order.
+
+    Pass ``commit=False`` when more setup writes follow, so the batch shares one commit.
+    """
+    rows = [{"id": uuid.uuid4(), **row} for row in rows]
+    db.execute(insert(model), rows)
+    if commit:
+        db.commit()
+    return [row["id"] for row in rows]
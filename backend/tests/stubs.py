@@ -0,0 +1,102 @@
+"""Shared test doubles for the embedding and vector services."""
+from __future__ import annotations
+
+from dataclasses import replace
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from app.services.vector_service import VectorSearchResults
+
+
+@lru_cache(maxsize=1)
+def _canned_results() -> VectorSearchResults:
+    """Built on first search so importing the stubs does not load the Qdrant client."""
+    from app.services.vector_service import VectorSearchResults
+
+    # Callers only read search hits, so every search can hand back the same canned items.
+    return VectorSearchResults(
+        items=[
+            {
+                "document_id": str(uuid4()),
+                "chunk_id": str(uuid4()),
+                "score": 0.88,
+                "text": "Retained chunk",
+                "source": "incident.txt",
+                "chunk_index": 0,
+                "page_number": 1,
+                "metadata": {
+                    "tags": ["ops"],
+                    "filename": "incident.txt",
+                    "document_type": "playbook",
+                    "created_at": "2024-03-11T00:00:00",
+                },
+            }
+        ],
+        has_more=False,
+    )
+
+
+# Shared across every call and chunk; callers only read the vector, never mutate it.
+_EMBEDDING = [0.1, 0.2, 0.3]
+_EMBED_META = {"embedding": _EMBEDDING, "embedding_model": "stub", "embedding_dimension": len(_EMBEDDING)}
+
+
+class StubEmbeddingService:
+    model_name = "stub"
+
+    def __init__(self) -> None:
+        self.last_chunk_args: dict[str, int] | None = None
+
+    def chunk_text_for_embedding(self, text: str, max_chunk_size: int = 512, overlap_size: int = 50):
+        self.last_chunk_args = {"max_chunk_size": max_chunk_size, "overlap_size": overlap_size}
+        t = text.strip()
+        return [{"text": t, "chunk_index": 0, "start_char": 0, "end_char": len(t), "chunk_size": len(t)}]
+
+    async def embed_text(self, text: str):
+        return _EMBEDDING
+
+    async def embed_document_chunks(self, chunks):
+        return [{**chunk, **_EMBED_META} for chunk in chunks]
+
+
+class StubVectorService:
+    def __init__(self) -> None:
+        self.init_calls = 0
+        self.deleted: list[tuple[str, str]] = []
+        self.add_calls: list[dict[str, object]] = []
+        self.last_call: dict[str, object] = {}
+        self.default_collection = "test-documents"
+
+    async def init_collection(self, collection_name=None):
+        self.init_calls += 1
+        return True
+
+    async def delete_document(self, tenant_id, document_id, collection_name=None):
+        self.deleted.append((tenant_id, document_id))
+        return True
+
+    async def add_documents(self, *, tenant_id, documents, collection_name=None, embeddings=None):
+        self.add_calls.append({"tenant_id": tenant_id, "documents": documents, "embeddings": embeddings})
+        return True
+
+    async def search_documents(
+        self,
+        *,
+        tenant_id,
+        query_embedding,
+        limit,
+        score_threshold,
+        filter_conditions,
+        offset=0,
+    ):
+        self.last_call = {
+            "tenant_id": tenant_id,
+            "query_embedding": query_embedding,
+            "limit": limit,
+            "score_threshold": score_threshold,
+            "filter_conditions": filter_conditions,
+            "offset": offset,
+        }
+        return replace(_canned_results(), next_offset=offset + limit if limit else None)
@@ -5,6 +5,9 @@ import uuid
 
 import pytest
 
+from app.dependencies import require_admin_role
+from app.services.tenant_service import TenantService
+
 
 class TestHealthEndpoints:
     """Health check and root status tests."""
@@ -96,3 +99,41 @@ class TestQueryEndpoints:
         response = client.get("/api/v1/queries/history")
 
         assert response.status_code == 401
+
+
+class TestTenantAdminEndpoints:
+    """Tenant listing cursor parameters."""
+
+    @pytest.fixture()
+    def admin_client(self, client, tenant_and_user):
+        _, user = tenant_and_user
+        client.app.dependency_overrides[require_admin_role] = lambda: user
+        return client
+
+    def test_list_tenants_follows_keyset_cursor(self, admin_client, db_session):
+        service = TenantService()
+        for index in range(3):
+            service.create_tenant(db_session, name=f"Cursor Corp {index}")
+
+        first = admin_client.get("/api/v1/auth/tenants", params={"limit": 2})
+        assert first.status_code == 200
+        last = first.json()[-1]
+        second = admin_client.get(
+            "/api/v1/auth/tenants",
+            params={"limit": 10, "after_created_at": last["created_at"], "after_id": last["id"]},
+        )
+
+        assert second.status_code == 200
+        first_ids = {tenant["id"] for tenant in first.json()}
+        second_ids = {tenant["id"] for tenant in second.json()}
+        assert len(first_ids) == 2
+        assert len(second_ids) == 2  # the remaining created tenant plus the seeded one
+        assert first_ids.isdisjoint(second_ids)
+
+    @pytest.mark.parametrize("half", ["after_created_at", "after_id"])
+    def test_list_tenants_rejects_half_a_cursor(self, admin_client, half):
+        value = "2026-01-01T00:00:00" if half == "after_created_at" else str(uuid.uuid4())
+
+        response = admin_client.get("/api/v1/auth/tenants", params={half: value})
+
+        assert response.status_code == 422
@@ -0,0 +1,12 @@
+"""Unit tests for cache payload encoding."""
+from __future__ import annotations
+
+import numpy as np
+
+from app.services.cache_service import _dumps, _loads
+
+
+def test_payload_codec_round_trips_numpy_vectors():
+    payload = {"vector": np.asarray([0.5, 1.5], dtype=np.float32), "items": [{"chunk_id": "c1"}]}
+
+    assert _loads(_dumps(payload)) == {"vector": [0.5, 1.5], "items": [{"chunk_id": "c1"}]}
@@ -1,12 +1,11 @@
 """Unit tests for ConversationService."""
 from __future__ import annotations
 
-import asyncio
 from typing import Any
 
+import anyio
 import pytest
 
-from app.models.tenant import Tenant, TenantUser
 from app.services.conversation_service import ConversationService
 
 
@@ -25,25 +24,10 @@ class _FakeLLMService:
     async def generate_text_response(self, **kwargs: Any) -> _FakeLLMResponse:
         prompt = kwargs.get("prompt", "")
         self.calls.append(prompt)
-        await asyncio.sleep(0)
+        await anyio.sleep(0)
         return _FakeLLMResponse(self.response_text)
 
 
-@pytest.fixture
-def tenant_and_user(db_session):
-    tenant = Tenant(name="Test Tenant", subdomain="test-tenant")
-    user = TenantUser(
-        tenant=tenant,
-        email="user@example.com",
-        username="tester",
-        hashed_password="hashed",
-    )
-    db_session.add(tenant)
-    db_session.add(user)
-    db_session.commit()
-    return tenant, user
-
-
 def test_create_session_and_messages(db_session, tenant_and_user):
     tenant, user = tenant_and_user
     service = ConversationService()
@@ -73,7 +57,8 @@ def test_create_session_and_messages(db_session, tenant_and_user):
     assert context == [{"role": "user", "content": "Hello"}]
 
 
-def test_generate_title_updates_session(db_session, tenant_and_user):
+@pytest.mark.anyio
+async def test_generate_title_updates_session(db_session, tenant_and_user):
     tenant, user = tenant_and_user
     fake_llm = _FakeLLMService("Budget Review")
     service = ConversationService(llm_service=fake_llm)
@@ -96,9 +81,8 @@ def test_generate_title_updates_session(db_session, tenant_and_user):
         author_id=None,
     )
 
-    title = asyncio.run(service.generate_title(db_session, tenant.id, session.id))
+    title = await service.generate_title(db_session, tenant.id, session.id)
 
     assert title == "Budget Review"
     assert fake_llm.calls, "LLM should be invoked for title generation"
-    db_session.refresh(session)
     assert session.title == "Budget Review"
\ No newline at end of file
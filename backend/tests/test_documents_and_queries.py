@@ -1,4 +1,8 @@
-"""Tests covering document search filters and query analytics summaries."""
+"""Tests covering document search filters and query analytics summaries.
+
+The API handlers are imported inside each test: ``app.api`` loads every router and the
+provider SDKs behind them, which collection alone should not pay for.
+"""
 from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
@@ -6,81 +10,16 @@ from uuid import uuid4
 
 import pytest
 
-from app.api.documents import search_documents
-from app.api.queries import get_query_analytics
 from app.models.query import Query
-from app.models.tenant import Tenant, TenantUser
 from app.schemas.document import DocumentSearchRequest
-from app.services.vector_service import VectorSearchResults
-
-
-@pytest.fixture
-def tenant_and_user(db_session):
-    tenant = Tenant(name="Logging Corp", subdomain="logging")
-    user = TenantUser(
-        tenant=tenant,
-        email="observer@example.com",
-        username="observer",
-        hashed_password="hashed",
-    )
-    db_session.add(tenant)
-    db_session.add(user)
-    db_session.commit()
-    return tenant, user
-
-
-class _StubEmbeddingService:
-    async def embed_text(self, text: str):
-        return [0.1, 0.2, 0.3]
-
-
-class _StubVectorService:
-    def __init__(self):
-        self.last_call = {}
-
-    async def search_documents(
-        self,
-        *,
-        tenant_id,
-        query_embedding,
-        limit,
-        score_threshold,
-        filter_conditions,
-        offset=0,
-    ):
-        self.last_call = {
-            "tenant_id": tenant_id,
-            "query_embedding": query_embedding,
-            "limit": limit,
-            "score_threshold": score_threshold,
-            "filter_conditions": filter_conditions,
-            "offset": offset,
-        }
-        return VectorSearchResults(
-            items=[
-                {
-                    "document_id": str(uuid4()),
-                    "chunk_id": str(uuid4()),
-                    "score": 0.88,
-                    "text": "Retained chunk",
-                    "source": "incident.txt",
-                    "chunk_index": 0,
-                    "page_number": 1,
-                    "metadata": {
-                        "tags": ["ops"],
-                        "filename": "incident.txt",
-                        "document_type": "playbook",
-                        "created_at": "2024-03-11T00:00:00",
-                    },
-                }
-            ],
-            next_offset=offset + limit if limit else None,
-            has_more=False,
-        )
+from tests.factories import seed_rows
+from tests.stubs import StubEmbeddingService, StubVectorService
 
 
 @pytest.mark.anyio
 async def test_document_search_includes_filters(db_session, tenant_and_user):
+    from app.api.documents import search_documents
+
     tenant, user = tenant_and_user
     request = DocumentSearchRequest(
         query="outage",
@@ -90,8 +29,8 @@ async def test_document_search_includes_filters(db_session, tenant_and_user):
         tags=["ops"],
     )
 
-    vector_service = _StubVectorService()
-    embedding_service = _StubEmbeddingService()
+    vector_service = StubVectorService()
+    embedding_service = StubEmbeddingService()
 
     response = await search_documents(
         search_request=request,
@@ -118,6 +57,8 @@ async def test_document_search_includes_filters(db_session, tenant_and_user):
 
 @pytest.mark.anyio
 async def test_document_search_filters_by_type_and_dates(db_session, tenant_and_user):
+    from app.api.documents import search_documents
+
     tenant, user = tenant_and_user
     request = DocumentSearchRequest(
         query="analytics",
@@ -126,8 +67,8 @@ async def test_document_search_filters_by_type_and_dates(db_session, tenant_and_
         created_before=datetime(2024, 3, 20, tzinfo=UTC),
     )
 
-    vector_service = _StubVectorService()
-    embedding_service = _StubEmbeddingService()
+    vector_service = StubVectorService()
+    embedding_service = StubEmbeddingService()
 
     await search_documents(
         search_request=request,
@@ -147,35 +88,41 @@ async def test_document_search_filters_by_type_and_dates(db_session, tenant_and_
 
 @pytest.mark.anyio
 async def test_query_analytics_summary(db_session, tenant_and_user):
+    from app.api.queries import get_query_analytics
+
     tenant, user = tenant_and_user
-    earlier = datetime.now(UTC) - timedelta(days=2)
     today = datetime.now(UTC)
-
-    historic_query = Query(
-        tenant_id=tenant.id,
-        user_id=user.id,
-        query_text="Old request",
-        query_type="rag",
-        processing_time_ms=150.0,
-        total_tokens=200,
-        estimated_cost=0.12,
-        created_at=earlier,
-        status="completed",
-    )
-    recent_query = Query(
-        tenant_id=tenant.id,
-        user_id=user.id,
-        query_text="Recent request",
-        query_type="analytics",
-        processing_time_ms=90.0,
-        total_tokens=120,
-        estimated_cost=0.08,
-        user_rating=4,
-        created_at=today,
-        status="completed",
+    earlier = today - timedelta(days=2)
+
+    seed_rows(
+        db_session,
+        Query,
+        [
+            {
+                "tenant_id": tenant.id,
+                "user_id": user.id,
+                "query_text": "Old request",
+                "query_type": "rag",
+                "processing_time_ms": 150.0,
+                "total_tokens": 200,
+                "estimated_cost": 0.12,
+                "created_at": earlier,
+                "status": "completed",
+            },
+            {
+                "tenant_id": tenant.id,
+                "user_id": user.id,
+                "query_text": "Recent request",
+                "query_type": "analytics",
+                "processing_time_ms": 90.0,
+                "total_tokens": 120,
+                "estimated_cost": 0.08,
+                "user_rating": 4,
+                "created_at": today,
+                "status": "completed",
+            },
+        ],
     )
-    db_session.add_all([historic_query, recent_query])
-    db_session.commit()
 
     analytics = await get_query_analytics(
         current_user=user,
@@ -1,128 +1,121 @@
 """Integration tests for document API upload behavior."""
 from __future__ import annotations
 
+import io
 import json
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
+from types import MappingProxyType
 from typing import Any
+from unittest.mock import ANY, AsyncMock
 from uuid import UUID, uuid4
 
+import httpx
 import pytest
-from fastapi import UploadFile
+from fastapi import BackgroundTasks, UploadFile
 
+from app.api.documents import upload_document as upload_route
 from app.dependencies import get_current_tenant, get_current_user, get_document_service
 from app.models.document import Document
-from app.models.tenant import Tenant, TenantUser
-
-
-class _StubDocumentService:
-    def __init__(self) -> None:
-        self.upload_kwargs: dict[str, Any] | None = None
-        self.process_calls: list[dict[str, str]] = []
-        self._document: Document | None = None
-        self.reprocess_candidates: list[Document] = []
-        self.reprocess_missing: list[UUID] = []
-        self.last_reprocess_query: dict[str, Any] | None = None
-
-    @property
-    def document(self) -> Document:
-        assert self._document is not None
-        return self._document
-
-    async def upload_document(
-        self,
-        db,
-        tenant_id: str,
-        file: UploadFile,
-        metadata: dict[str, Any] | None = None,
-        title: str | None = None,
-        tags: list[str] | None = None,
-    ) -> Document:
-        # Capture the inputs so the test can assert on merge behavior.
-        captured_metadata = metadata or {}
-        captured_tags = list(tags or [])
-        self.upload_kwargs = {
-            "tenant_id": tenant_id,
-            "filename": file.filename,
-            "metadata": captured_metadata,
-            "title": title,
-            "tags": captured_tags,
-        }
-
-        content = await file.read()
-        now = datetime.now(UTC)
-        document = Document(
-            id=uuid4(),
-            tenant_id=UUID(tenant_id),
-            filename="stored-summary.txt",
-            original_filename=file.filename or "summary.txt",
-            content_type=file.content_type or "text/plain",
-            file_size=len(content),
-            file_path="/tmp/stored-summary.txt",
-            status="uploaded",
-            total_chunks=0,
-            processed_chunks=0,
-            title=title,
-            summary=None,
-            language="en",
-            word_count=0,
-            collection_name=None,
-            embedding_model=None,
-            doc_metadata=captured_metadata,
-            tags=captured_tags,
-            uploaded_at=now,
-            processed_at=None,
-            created_at=now,
-        )
-        self._document = document
-        return document
-
-    async def process_document(self, db, document_id: str, tenant_id: str) -> bool:
-        self.process_calls.append({"document_id": document_id, "tenant_id": tenant_id})
-        return True
-
-    def select_documents_for_reprocessing(
-        self,
-        db,
-        tenant_id: str,
-        *,
-        document_ids: list[str] | None = None,
-        status_filter: str | None = None,
-        limit: int | None = None,
-    ) -> tuple[list[Document], list[UUID]]:
-        self.last_reprocess_query = {
-            "tenant_id": tenant_id,
-            "document_ids": document_ids,
-            "status_filter": status_filter,
-            "limit": limit,
-        }
-        return list(self.reprocess_candidates), list(self.reprocess_missing)
-
-
-@pytest.mark.usefixtures("client")
-def test_upload_document_merges_payload_and_schedules_processing(client, db_session):
-    stub_service = _StubDocumentService()
-    client.app.dependency_overrides[get_document_service] = lambda: stub_service
-
-    try:
-        tenant = Tenant(name="Acme Corp", subdomain="acme")
-        db_session.add(tenant)
-        db_session.commit()
-
-        user = TenantUser(
-            tenant_id=tenant.id,
-            email="admin@acme.io",
-            username="acme-admin",
-            hashed_password="hashed",
-            role="admin",
-            is_active=True,
-        )
-        db_session.add(user)
-        db_session.commit()
-
-        client.app.dependency_overrides[get_current_user] = lambda: user
-        client.app.dependency_overrides[get_current_tenant] = lambda: tenant
-
-        payload = {
+from app.services.document_service import DocumentService
+
+# Fields every stubbed upload shares; the ORM instance itself cannot be copied as a template
+# because it carries its own instance state.
+_UPLOADED_DOCUMENT_FIELDS = MappingProxyType(
+    {
+        "filename": "stored-summary.txt",
+        "file_path": "/tmp/stored-summary.txt",
+        "status": "uploaded",
+        "total_chunks": 0,
+        "processed_chunks": 0,
+        "summary": None,
+        "language": "en",
+        "word_count": 0,
+        "collection_name": None,
+        "embedding_model": None,
+        "processed_at": None,
+    }
+)
+
+
+def _make_doc(
+    tenant_id: UUID,
+    *,
+    filename: str,
+    status: str,
+    title: str,
+    file_size: int,
+    uploaded_at: datetime,
+    total_chunks: int = 0,
+    processed_chunks: int = 0,
+    word_count: int = 0,
+    processed_at: datetime | None = None,
+) -> Document:
+    return Document(
+        id=uuid4(),
+        tenant_id=tenant_id,
+        filename=filename,
+        original_filename=filename,
+        content_type="text/plain",
+        file_size=file_size,
+        file_path=f"/tmp/{filename}",
+        status=status,
+        total_chunks=total_chunks,
+        processed_chunks=processed_chunks,
+        title=title,
+        word_count=word_count,
+        summary=None,
+        language="en",
+        collection_name=None,
+        embedding_model=None,
+        doc_metadata={},
+        tags=["ops"],
+        uploaded_at=uploaded_at,
+        processed_at=processed_at,
+        created_at=uploaded_at,
+    )
+
+
+async def _stored_upload(
+    *,
+    db,
+    tenant_id: str,
+    file: UploadFile,
+    metadata: dict[str, Any] | None = None,
+    title: str | None = None,
+    tags: list[str] | None = None,
+) -> Document:
+    # Echo the merged inputs back the way DocumentService would store them.
+    now = datetime.now(UTC)
+    return Document(
+        **_UPLOADED_DOCUMENT_FIELDS,
+        id=uuid4(),
+        tenant_id=UUID(tenant_id),
+        original_filename=file.filename or "summary.txt",
+        content_type=file.content_type or "text/plain",
+        # Starlette records the size while parsing the multipart body; no need to copy it out.
+        file_size=file.size if file.size is not None else len(await file.read()),
+        title=title,
+        doc_metadata=metadata or {},
+        tags=list(tags or []),
+        uploaded_at=now,
+        created_at=now,
+    )
+
+
+def _document_service_mock() -> AsyncMock:
+    service = AsyncMock(spec=DocumentService)
+    service.upload_document.side_effect = _stored_upload
+    service.process_document.return_value = True
+    service.select_documents_for_reprocessing.return_value = ([], [])
+    return service
+
+
+# Multipart form fields per upload scenario, serialised once at import:
+# (form, expected title, expected tags, expected metadata).
+_UPLOAD_CASES = [
+    pytest.param(
+        {
             "metadata": json.dumps({"severity": "p0"}),
             "tags": json.dumps(["analytics", "ops"]),
             "upload_payload": json.dumps(
@@ -132,146 +125,178 @@ def test_upload_document_merges_payload_and_schedules_processing(client, db_sess
                     "metadata": {"document_type": "summary"},
                 }
             ),
-        }
-
-        files = {"file": ("summary.txt", b"incident summary", "text/plain")}
-
-        response = client.post(
-            "/api/v1/documents/upload",
-            data=payload,
-            files=files,
-        )
-
-        assert response.status_code == 200
-        body = response.json()
-        assert body["title"] == "Ops Summary"
-        assert body["doc_metadata"] == {"severity": "p0", "document_type": "summary"}
-        assert body["tags"] == ["ops", "p0", "analytics"]
-
-        assert stub_service.upload_kwargs is not None
-        assert stub_service.upload_kwargs["metadata"] == {"severity": "p0", "document_type": "summary"}
-        assert stub_service.upload_kwargs["tags"] == ["ops", "p0", "analytics"]
-        assert stub_service.upload_kwargs["title"] == "Ops Summary"
-
-        assert stub_service.process_calls == [
-            {"document_id": str(stub_service.document.id), "tenant_id": str(tenant.id)}
-        ]
-    finally:
-        client.app.dependency_overrides.pop(get_document_service, None)
-        client.app.dependency_overrides.pop(get_current_user, None)
-        client.app.dependency_overrides.pop(get_current_tenant, None)
-
-
-@pytest.mark.usefixtures("client")
-def test_reprocess_documents_endpoint_schedules_expected_candidates(client, db_session):
-    stub_service = _StubDocumentService()
-    client.app.dependency_overrides[get_document_service] = lambda: stub_service
-
-    try:
-        tenant = Tenant(name="Acme Corp", subdomain="acme")
-        db_session.add(tenant)
-        db_session.commit()
-
-        user = TenantUser(
-            tenant_id=tenant.id,
-            email="admin@acme.io",
-            username="acme-admin",
-            hashed_password="hashed",
-            role="admin",
-            is_active=True,
-        )
-        db_session.add(user)
-        db_session.commit()
-
-        client.app.dependency_overrides[get_current_user] = lambda: user
-        client.app.dependency_overrides[get_current_tenant] = lambda: tenant
-
-        now = datetime.now(UTC)
-        processed = Document(
-            id=uuid4(),
-            tenant_id=tenant.id,
-            filename="processed.txt",
-            original_filename="processed.txt",
-            content_type="text/plain",
-            file_size=12,
-            file_path="/tmp/processed.txt",
-            status="processed",
-            total_chunks=2,
-            processed_chunks=2,
-            title="Processed",
-            summary=None,
-            language="en",
-            word_count=20,
-            collection_name=None,
-            embedding_model=None,
-            doc_metadata={},
-            tags=["ops"],
-            uploaded_at=now,
-            processed_at=now,
-            created_at=now,
-        )
-
-        uploaded = Document(
-            id=uuid4(),
-            tenant_id=tenant.id,
-            filename="uploaded.txt",
-            original_filename="uploaded.txt",
-            content_type="text/plain",
-            file_size=10,
-            file_path="/tmp/uploaded.txt",
-            status="uploaded",
-            total_chunks=0,
-            processed_chunks=0,
-            title="Uploaded",
-            summary=None,
-            language="en",
-            word_count=0,
-            collection_name=None,
-            embedding_model=None,
-            doc_metadata={},
-            tags=["ops"],
-            uploaded_at=now,
-            processed_at=None,
-            created_at=now,
-        )
-
-        missing_id = uuid4()
-        stub_service.reprocess_candidates = [processed, uploaded]
-        stub_service.reprocess_missing = [missing_id]
-
-        payload = {
-            "document_ids": [str(processed.id), str(uploaded.id), str(missing_id)],
-        }
-
-        response = client.post(
-            "/api/v1/documents/reprocess",
-            json=payload,
-        )
-
-        assert response.status_code == 200
-        body = response.json()
-        assert body["requested"] == 3
-        assert body["matched"] == 2
-        assert body["scheduled"] == 1
-        assert body["skipped"] == 1
-        assert str(missing_id) in [entry for entry in body["missing"]]
-
-        actions = {item["document_id"]: item["action"] for item in body["results"]}
-        assert actions[str(uploaded.id)] == "queued"
-        assert actions[str(processed.id)] == "skipped"
-        assert actions[str(missing_id)] == "missing"
-
-        assert stub_service.process_calls == [
-            {"document_id": str(uploaded.id), "tenant_id": str(tenant.id)}
-        ]
-
-        assert stub_service.last_reprocess_query == {
-            "tenant_id": str(tenant.id),
-            "document_ids": [str(processed.id), str(uploaded.id), str(missing_id)],
-            "status_filter": None,
-            "limit": None,
-        }
-    finally:
-        client.app.dependency_overrides.pop(get_document_service, None)
-        client.app.dependency_overrides.pop(get_current_user, None)
-        client.app.dependency_overrides.pop(get_current_tenant, None)
\ No newline at end of file
+        },
+        "Ops Summary",
+        ["ops", "p0", "analytics"],
+        {"severity": "p0", "document_type": "summary"},
+        id="upload-payload-merged",
+    ),
+    pytest.param(
+        {
+            "title": "Form Title",
+            "metadata": json.dumps({"severity": "p1"}),
+            "tags": json.dumps([" ops ", "ops", ""]),
+        },
+        "Form Title",
+        ["ops"],
+        {"severity": "p1"},
+        id="form-fields-only",
+    ),
+]
+_FILE_BYTES = b"incident summary"
+# Form parameters default to ``Form(None)`` markers, so direct handler calls pass every field.
+_EMPTY_FORM = MappingProxyType({"metadata": None, "title": None, "tags": None, "upload_payload": None})
+
+
+@pytest.fixture(scope="module")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(scope="module")
+async def async_client(_session_client) -> AsyncIterator[httpx.AsyncClient]:
+    # Calls the ASGI app in-loop instead of through TestClient's thread portal.
+    transport = httpx.ASGITransport(app=_session_client.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
+
+
+@pytest.fixture
+def document_service(client, tenant_and_user) -> AsyncMock:
+    """A fresh service mock wired into the app for one test.
+
+    The ``client`` fixture clears the dependency overrides again on teardown.
+    """
+    tenant, user = tenant_and_user
+    service = _document_service_mock()
+    client.app.dependency_overrides[get_document_service] = lambda: service
+    client.app.dependency_overrides[get_current_user] = lambda: user
+    client.app.dependency_overrides[get_current_tenant] = lambda: tenant
+    return service
+
+
+@pytest.mark.anyio
+@pytest.mark.integration
+async def test_upload_document_merges_payload_and_schedules_processing(async_client, tenant_and_user, document_service):
+    # Wire-format smoke test: multipart parsing, dependency resolution and the response model.
+    tenant, _ = tenant_and_user
+    form, expected_title, expected_tags, expected_metadata = _UPLOAD_CASES[0].values
+    files = {"file": ("summary.txt", _FILE_BYTES, "text/plain")}
+
+    response = await async_client.post(
+        "/api/v1/documents/upload",
+        data=form,
+        files=files,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["title"] == expected_title
+    assert body["doc_metadata"] == expected_metadata
+    assert body["tags"] == expected_tags
+    assert body["file_size"] == len(_FILE_BYTES)
+
+    document_service.upload_document.assert_awaited_once_with(
+        db=ANY,
+        tenant_id=str(tenant.id),
+        file=ANY,
+        metadata=expected_metadata,
+        title=expected_title,
+        tags=expected_tags,
+    )
+    document_service.process_document.assert_awaited_once_with(
+        db=ANY, document_id=body["id"], tenant_id=str(tenant.id)
+    )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(("form", "expected_title", "expected_tags", "expected_metadata"), _UPLOAD_CASES)
+async def test_upload_route_merges_form_fields(
+    tenant_and_user, form, expected_title, expected_tags, expected_metadata
+):
+    # Merge rules are checked on the handler itself; the HTTP layer is covered by the smoke test.
+    tenant, user = tenant_and_user
+    service = _document_service_mock()
+    background_tasks = BackgroundTasks()
+    upload = UploadFile(filename="summary.txt", file=io.BytesIO(_FILE_BYTES), size=len(_FILE_BYTES))
+
+    document = await upload_route(
+        background_tasks=background_tasks,
+        current_user=user,
+        current_tenant=tenant,
+        db=None,
+        document_service=service,
+        file=upload,
+        **{**_EMPTY_FORM, **form},
+    )
+
+    assert (document.title, document.tags, document.doc_metadata) == (
+        expected_title,
+        expected_tags,
+        expected_metadata,
+    )
+    service.upload_document.assert_awaited_once()
+    assert [(task.func, task.kwargs["document_id"]) for task in background_tasks.tasks] == [
+        (service.process_document, str(document.id))
+    ]
+
+
+@pytest.mark.anyio
+@pytest.mark.integration
+async def test_reprocess_documents_endpoint_schedules_expected_candidates(async_client, tenant_and_user, document_service):
+    tenant, _ = tenant_and_user
+
+    now = datetime.now(UTC)
+    processed = _make_doc(
+        tenant.id,
+        filename="processed.txt",
+        status="processed",
+        title="Processed",
+        file_size=12,
+        total_chunks=2,
+        processed_chunks=2,
+        word_count=20,
+        uploaded_at=now,
+        processed_at=now,
+    )
+    uploaded = _make_doc(
+        tenant.id,
+        filename="uploaded.txt",
+        status="uploaded",
+        title="Uploaded",
+        file_size=10,
+        uploaded_at=now,
+    )
+
+    missing = uuid4()
+    document_service.select_documents_for_reprocessing.return_value = ([processed, uploaded], [missing])
+    tenant_id = str(tenant.id)
+    processed_id, uploaded_id, missing_id = str(processed.id), str(uploaded.id), str(missing)
+    document_ids = [processed_id, uploaded_id, missing_id]
+
+    response = await async_client.post(
+        "/api/v1/documents/reprocess",
+        json={"document_ids": document_ids},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["requested"] == 3
+    assert body["matched"] == 2
+    assert body["scheduled"] == 1
+    assert body["skipped"] == 1
+    assert missing_id in body["missing"]
+
+    actions = {item["document_id"]: item["action"] for item in body["results"]}
+    assert actions[uploaded_id] == "queued"
+    assert actions[processed_id] == "skipped"
+    assert actions[missing_id] == "missing"
+
+    document_service.process_document.assert_awaited_once_with(ANY, uploaded_id, tenant_id)
+    document_service.select_documents_for_reprocessing.assert_called_once_with(
+        db=ANY,
+        tenant_id=tenant_id,
+        document_ids=document_ids,
+        status_filter=None,
+        limit=None,
+    )
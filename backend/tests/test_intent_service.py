@@ -0,0 +1,81 @@
+"""Unit tests for the intent classifier parsing and fallback rules."""
+from __future__ import annotations
+
+import pytest
+
+from app.schemas.agent import AgentIntent
+from app.services.intent_service import IntentClassifier, IntentResult, IntentType
+
+
+@pytest.fixture
+def classifier() -> IntentClassifier:
+    return IntentClassifier(llm_service=None)  # type: ignore[arg-type]
+
+
+def test_parse_response_sanitises_fields(classifier):
+    payload = (
+        '{"intent": " Action ", "confidence": 1.7, "reasoning": " wants a task ",'
+        ' "entities": ["db", " ", 42], "requested_action": "  "}'
+    )
+
+    result = classifier._parse_response(payload)
+
+    assert result == IntentResult(
+        intent=IntentType.ACTION,
+        confidence=1.0,
+        reasoning="wants a task",
+        entities=["db", "42"],
+        requested_action=None,
+    )
+
+
+def test_parse_response_extracts_json_wrapped_in_prose(classifier):
+    payload = 'Sure! Here you go: {"intent": "analytical", "confidence": 0.8} Hope that helps.'
+
+    result = classifier._parse_response(payload)
+
+    assert result is not None
+    assert (result.intent, result.confidence) == (IntentType.ANALYTICAL, 0.8)
+
+
+def test_parse_response_rejects_non_json(classifier):
+    assert classifier._parse_response("no structured output here") is None
+
+
+def test_heuristic_fallback_prefers_clarify_over_action(classifier):
+    result = classifier._heuristic_fallback("Can you explain how to create a ticket?")
+
+    assert (result.intent, result.confidence) == (IntentType.CLARIFY, 0.6)
+
+
+def test_intent_result_round_trips_into_agent_schema():
+    result = IntentResult(intent=IntentType.INFORMATIONAL, confidence=0.4, entities=["vpn"])
+
+    intent = AgentIntent(**result.to_dict())
+
+    assert intent.intent == IntentType.INFORMATIONAL
+    assert intent.entities == ["vpn"]
+    assert intent.raw_response is None
+
+
+def test_parse_response_takes_first_balanced_object(classifier):
+    payload = 'Result: {"intent": "clarify", "reasoning": "ambiguous {scope}"} and {"intent": "action"}'
+
+    result = classifier._parse_response(payload)
+
+    assert result is not None
+    assert (result.intent, result.reasoning) == (IntentType.CLARIFY, "ambiguous {scope}")
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("Show the metrics for last week", (IntentType.ANALYTICAL, 0.5)),
+        ("Compare outages, then schedule a review", (IntentType.ACTION, 0.6)),
+        ("Where is the VPN guide?", (IntentType.INFORMATIONAL, 0.3)),
+    ],
+)
+def test_heuristic_fallback_keyword_priority(classifier, query, expected):
+    result = classifier._heuristic_fallback(query)
+
+    assert (result.intent, result.confidence) == expected
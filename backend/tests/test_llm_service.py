@@ -0,0 +1,56 @@
+"""Unit tests for LLM provider streaming behaviour."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.llm_service import OpenAIProvider
+
+
+class _FakeOpenAIStream:
+    def __init__(self, deltas: list[str]) -> None:
+        self._deltas = deltas
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for delta in self._deltas:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _provider_with_stream(stream: _FakeOpenAIStream) -> OpenAIProvider:
+    async def create(**_: object) -> _FakeOpenAIStream:
+        return stream
+
+    provider = OpenAIProvider.__new__(OpenAIProvider)
+    provider.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return provider
+
+
+@pytest.mark.anyio
+async def test_openai_stream_closes_upstream_when_consumer_aborts():
+    upstream = _FakeOpenAIStream(["Hello", " there", " friend"])
+    provider = _provider_with_stream(upstream)
+
+    stream = await provider.generate_stream([], model="gpt-4o-mini", temperature=0.0, max_tokens=16)
+    assert await stream.__anext__() == "Hello"
+    await stream.aclose()
+
+    assert upstream.closed is True
+
+
+@pytest.mark.anyio
+async def test_openai_stream_skips_empty_deltas_and_closes_on_completion():
+    upstream = _FakeOpenAIStream(["A", "", "B"])
+    provider = _provider_with_stream(upstream)
+
+    stream = await provider.generate_stream([], model="gpt-4o-mini", temperature=0.0, max_tokens=16)
+
+    assert [chunk async for chunk in stream] == ["A", "B"]
+    assert upstream.closed is True
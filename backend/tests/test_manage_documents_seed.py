@@ -1,13 +1,19 @@
 """Validation tests for the seed corpus utilities."""
 from __future__ import annotations
 
-import json
+import os
 from datetime import datetime
 from pathlib import Path
 
+import orjson
 import pytest
 
-from app.scripts.manage_documents import SeedTenantSpec, _normalize_created_at, load_seed_dataset
+from app.scripts.manage_documents import (
+    SeedTenantSpec,
+    _normalize_created_at,
+    iter_seed_dataset,
+    load_seed_dataset,
+)
 
 
 def test_normalize_created_at_handles_date_and_z_suffix():
@@ -18,31 +24,37 @@ def test_normalize_created_at_handles_date_and_z_suffix():
     assert with_z == "2024-05-12T15:30:00+00:00"
 
 
-def test_load_seed_dataset_populates_defaults(tmp_path: Path):
-    dataset = {
-        "tenants": [
-            {
-                "name": "Example Tenant",
-                "subdomain": "example",
-                "documents": [
-                    {
-                        "title": "Example Doc",
-                        "filename": "example_doc.txt",
-                        "document_type": "policy",
-                        "created_at": "2024-04-01",
-                        "tags": ["compliance", "policy"],
-                        "metadata": {"owner": "GRC"},
-                        "content": "Guidance for the assistant."
-                    }
-                ]
-            }
-        ]
-    }
+_EXAMPLE_DATASET = {
+    "tenants": [
+        {
+            "name": "Example Tenant",
+            "subdomain": "example",
+            "documents": [
+                {
+                    "title": "Example Doc",
+                    "filename": "example_doc.txt",
+                    "document_type": "policy",
+                    "created_at": "2024-04-01",
+                    "tags": ["compliance", "policy"],
+                    "metadata": {"owner": "GRC"},
+                    "content": "Guidance for the assistant.",
+                }
+            ]
+        }
+    ]
+}
 
-    dataset_path = tmp_path / "seed.json"
-    dataset_path.write_text(json.dumps(dataset), encoding="utf-8")
 
-    tenants = load_seed_dataset(dataset_path)
+@pytest.fixture(scope="module")
+def seed_dataset_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # Read-only for the tests that use it, so one file serves the whole module.
+    path = tmp_path_factory.mktemp("seed") / "seed.json"
+    path.write_bytes(orjson.dumps(_EXAMPLE_DATASET))
+    return path
+
+
+def test_load_seed_dataset_populates_defaults(seed_dataset_path: Path):
+    tenants = load_seed_dataset(seed_dataset_path)
 
     assert isinstance(tenants[0], SeedTenantSpec)
     doc_spec = tenants[0].documents[0]
@@ -61,3 +73,33 @@ def test_load_seed_dataset_missing_file(tmp_path: Path):
     missing = tmp_path / "missing.json"
     with pytest.raises(FileNotFoundError):
         load_seed_dataset(missing)
+
+
+def test_load_seed_dataset_reuses_parse_until_file_changes(tmp_path: Path):
+    dataset_path = tmp_path / "seed.json"
+    dataset_path.write_bytes(orjson.dumps({"tenants": [{"name": "One", "subdomain": "one"}]}))
+
+    first = load_seed_dataset(dataset_path)
+    assert load_seed_dataset(dataset_path)[0] is first[0]
+
+    dataset_path.write_bytes(orjson.dumps({"tenants": [{"name": "Two", "subdomain": "two"}]}))
+    stat = dataset_path.stat()
+    os.utime(dataset_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert [tenant.subdomain for tenant in load_seed_dataset(dataset_path)] == ["two"]
+
+
+def test_iter_seed_dataset_skips_unselected_tenants(tmp_path: Path):
+    dataset = {
+        "tenants": [
+            {"name": "One", "subdomain": "one", "documents": [{"title": "Broken"}]},
+            {"name": "Two", "subdomain": "Two", "documents": []},
+        ]
+    }
+    dataset_path = tmp_path / "seed.json"
+    dataset_path.write_bytes(orjson.dumps(dataset))
+
+    # The first tenant's document lacks content; it is never built because the tenant is filtered out.
+    assert [tenant.name for tenant in iter_seed_dataset(dataset_path, {"two"})] == ["Two"]
+    with pytest.raises(FileNotFoundError):
+        iter_seed_dataset(tmp_path / "missing.json")
@@ -0,0 +1,99 @@
+"""Unit tests for prompt template rendering helpers."""
+from __future__ import annotations
+
+import pytest
+
+from app.services.prompt_template_service import PromptTemplateService, _compile_template
+
+
+def test_intent_prompt_embeds_query_and_schema():
+    prompt = PromptTemplateService.intent_prompt("Why did {service} fail?")
+
+    assert "Query: Why did {service} fail?" in prompt
+    assert PromptTemplateService.FORMAT_INSTRUCTIONS["json_intent"] in prompt
+    assert "{query}" not in prompt
+
+
+def test_action_planner_prompt_keeps_literal_schema_braces():
+    prompt = PromptTemplateService.action_planner_prompt("Open a task for the VPN outage")
+
+    assert "Open a task for the VPN outage" in prompt
+    assert '"arguments": {"key": "value"}' in prompt
+
+
+def test_decomposition_prompts_fill_dynamic_sections():
+    direct = PromptTemplateService.decomposition_prompt("Compare backup policies")
+    informed = PromptTemplateService.decomposition_prompt(
+        "Compare backup policies",
+        informed=True,
+        initial_summary="Nightly snapshots exist.",
+        context_snippets="[Source 1] Backup SOP",
+    )
+
+    assert direct.startswith(PromptTemplateService.AGENT_ROLES["decomposer"])
+    assert "Original Query: Compare backup policies" in direct
+    assert "Initial Summary:\nNightly snapshots exist." in informed
+    assert "Context Snippets:\n[Source 1] Backup SOP" in informed
+
+
+def test_template_tables_are_read_only():
+    with pytest.raises(TypeError):
+        PromptTemplateService.SYSTEM_MESSAGES["rag"] = "override"  # type: ignore[index]
+
+    assert PromptTemplateService.get_system_message("unknown") == PromptTemplateService.SYSTEM_MESSAGES["rag"]
+
+
+def test_compiled_template_folds_static_fields_and_unescapes_braces():
+    render = _compile_template("{role}: {{literal}} {query}", role="Planner")
+
+    assert render(query="{user}") == "Planner: {literal} {user}"
+    with pytest.raises(KeyError):
+        render()
+
+
+def test_format_context_orders_by_score_and_truncates():
+    contexts = [
+        {"source": "low.md", "text": "ignored", "score": 0.1},
+        {"document_title": "Runbook", "text": "  Restart the VPN gateway service  ", "score": 0.9},
+        {"source": "empty.md", "text": "   ", "score": 0.5},
+    ]
+
+    rendered = PromptTemplateService.format_context(contexts, limit=2, max_length=15)
+
+    assert rendered == "[Source 1] Runbook\nRestart the..."
+
+
+def test_prompt_builders_return_cached_strings():
+    first = PromptTemplateService.intent_prompt("Reset the VPN token")
+
+    assert PromptTemplateService.intent_prompt("Reset the VPN token") is first
+    assert PromptTemplateService.chat_title_prompt("Reset the VPN token") == (
+        PromptTemplateService.chat_title_prompt_for_transcript("User: Reset the VPN token")
+    )
+
+
+def test_format_conversation_skips_system_and_blank_turns():
+    conversation = [
+        {"role": "system", "content": "hidden"},
+        {"role": "user", "content": " VPN is down "},
+        {"role": "assistant", "content": "   "},
+        {"role": "tool", "content": "ticket #42"},
+    ]
+
+    rendered = PromptTemplateService.format_conversation(conversation, "Any update?", limit=4)
+
+    assert rendered == (
+        "Previous conversation:\nUser: VPN is down\nTool: ticket #42\n\n"
+        "Considering the conversation above, answer this follow-up question: Any update?"
+    )
+    assert PromptTemplateService.format_conversation(conversation[:1], "Any update?") == "Any update?"
+
+
+def test_chat_title_prompt_accepts_dicts_and_objects():
+    class _Message:
+        role = "assistant"
+        content = " Restarted the gateway "
+
+    prompt = PromptTemplateService.chat_title_prompt([{"content": "VPN down"}, _Message(), {"role": "user"}])
+
+    assert "Transcript:\nUser: VPN down\nAssistant: Restarted the gateway\n" in prompt
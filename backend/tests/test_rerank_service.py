@@ -0,0 +1,66 @@
+"""Unit tests for cross-encoder reranking order and truncation."""
+from __future__ import annotations
+
+import pytest
+
+from app.services import rerank_service
+from app.services.rerank_service import RerankService
+
+
+@pytest.fixture(scope="module")
+def anyio_backend() -> str:
+    # The service offloads inference with asyncio's run_in_executor.
+    return "asyncio"
+
+
+class _StubCrossEncoder:
+    def __init__(self, scores: list[float]) -> None:
+        self.scores = scores
+        self.calls: list[dict[str, object]] = []
+
+    def predict(self, pairs, **kwargs):
+        self.calls.append({"pairs": list(pairs), **kwargs})
+        return self.scores[: len(pairs)]
+
+
+def _service(scores: list[float], *, max_candidates: int = 25) -> tuple[RerankService, _StubCrossEncoder]:
+    service = RerankService(enabled=False, max_candidates=max_candidates)
+    model = _StubCrossEncoder(scores)
+    service.enabled = True
+    service._model = model  # type: ignore[assignment]
+    return service, model
+
+
+@pytest.mark.anyio
+async def test_rerank_orders_by_score_and_keeps_ties_stable():
+    service, model = _service([0.2, 0.9, 0.2, 0.5])
+    items = [{"chunk_id": name, "text": name} for name in ("a", "b", "c", "d")]
+
+    ranked = await service.rerank("query", items, top_k=3)
+
+    assert [item["chunk_id"] for item in ranked] == ["b", "d", "a"]
+    assert ranked[0]["rerank_score"] == pytest.approx(0.9)
+    assert "rerank_score" not in items[1]
+    assert model.calls[0]["batch_size"] == service.batch_size
+
+
+@pytest.mark.anyio
+async def test_rerank_only_scores_max_candidates():
+    service, model = _service([0.1, 0.3, 0.2], max_candidates=2)
+    items = [{"chunk_id": name, "text": name} for name in ("a", "b", "c")]
+
+    ranked = await service.rerank("query", items)
+
+    assert [item["chunk_id"] for item in ranked] == ["b", "a"]
+    assert len(model.calls[0]["pairs"]) == 2
+
+
+@pytest.mark.anyio
+async def test_loaded_model_is_shared_across_instances(monkeypatch):
+    shared = _StubCrossEncoder([1.0])
+    monkeypatch.setitem(rerank_service._MODEL_CACHE, "stub-model", shared)
+    service = RerankService(model_name="stub-model", enabled=False)
+    service.enabled = True
+
+    assert await service._ensure_model() is shared
+    assert service.is_available()
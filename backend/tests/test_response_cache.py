@@ -0,0 +1,84 @@
+"""Unit tests for the semantic LLM response cache."""
+from __future__ import annotations
+
+import pytest
+
+from app.services.llm_service import LLMResponse
+from app.services.response_cache_service import SemanticResponseCache
+
+
+class _StubEmbeddings:
+    VECTORS = {
+        "how do I reset my vpn password": [1.0, 0.0, 0.0],
+        "how can I reset my VPN password?": [0.99, 0.05, 0.0],
+        "what is the lunch menu": [0.0, 1.0, 0.0],
+    }
+
+    async def embed_text(self, text: str) -> list[float]:
+        return self.VECTORS[text]
+
+
+def _response(content: str) -> LLMResponse:
+    return LLMResponse(
+        content=content,
+        usage={"total_tokens": 10},
+        model="gpt-4o-mini",
+        provider="openai",
+        finish_reason="stop",
+        metadata={},
+    )
+
+
+def _key(query: str, *, chunk: str = "vpn-1") -> str:
+    return SemanticResponseCache.build_context_key(
+        query=query,
+        provider="openai",
+        model="gpt-4o-mini",
+        system_prompt=None,
+        temperature=0.7,
+        max_tokens=512,
+        context_documents=[{"chunk_id": chunk, "text": "Reset via the portal."}],
+        conversation_history=[{"role": "user", "content": query}],
+    )
+
+
+@pytest.fixture
+def cache() -> SemanticResponseCache:
+    return SemanticResponseCache(_StubEmbeddings(), similarity_threshold=0.95, ttl_seconds=60, max_entries=2)
+
+
+@pytest.mark.anyio
+async def test_similar_query_in_same_context_hits(cache):
+    original = "how do I reset my vpn password"
+    paraphrase = "how can I reset my VPN password?"
+    assert _key(original) == _key(paraphrase)
+
+    await cache.store(_key(original), await cache.embed_query(original), _response("Use the portal."))
+    hit = await cache.lookup(_key(paraphrase), await cache.embed_query(paraphrase))
+
+    assert hit is not None
+    assert hit.content == "Use the portal."
+    assert hit.metadata["cache_hit"] is True
+    assert cache.hits == 1
+
+
+@pytest.mark.anyio
+async def test_different_context_or_topic_misses(cache):
+    query = "how do I reset my vpn password"
+    vector = await cache.embed_query(query)
+    await cache.store(_key(query), vector, _response("Use the portal."))
+
+    assert await cache.lookup(_key(query, chunk="vpn-2"), vector) is None
+    assert await cache.lookup(_key(query), await cache.embed_query("what is the lunch menu")) is None
+    assert cache.misses == 2
+
+
+@pytest.mark.anyio
+async def test_oldest_context_is_evicted_past_capacity(cache):
+    query = "how do I reset my vpn password"
+    vector = await cache.embed_query(query)
+    for chunk in ("a", "b", "c"):
+        await cache.store(_key(query, chunk=chunk), vector, _response(chunk))
+
+    assert await cache.lookup(_key(query, chunk="a"), vector) is None
+    assert (await cache.lookup(_key(query, chunk="c"), vector)).content == "c"
@@ -0,0 +1,153 @@
+"""Unit tests for retrieval caching behaviour."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.services.retrieval_service import RetrievalService
+from app.services.vector_service import VectorSearchResults
+
+
+@pytest.fixture(scope="module")
+def anyio_backend() -> str:
+    # Speculative embedding is scheduled with asyncio.create_task.
+    return "asyncio"
+
+
+def _service() -> RetrievalService:
+    return RetrievalService(embedding_service=object(), vector_service=object())  # type: ignore[arg-type]
+
+
+def test_filter_serialisation_ignores_ordering():
+    service = _service()
+
+    first = service._serialise_filters({"tags": ["vpn", "network"], "meta": {"team": "ops", "tier": 1}})
+    second = service._serialise_filters({"meta": {"tier": 1, "team": "ops"}, "tags": ["network", "vpn"]})
+
+    assert first == second
+    assert len(first) == 32
+    assert service._serialise_filters({}) == "*"
+
+
+def test_cache_key_varies_with_filters():
+    service = _service()
+
+    base = service._build_cache_key("tenant", " vpn reset ", 5, 0.3, {})
+    filtered = service._build_cache_key("tenant", "vpn reset", 5, 0.3, {"tags": ["vpn"]})
+
+    assert base.startswith("retrieval|tenant|")
+    assert base.endswith("|5|0.300|*")
+    assert base != filtered
+
+
+def test_cache_key_folds_case_width_and_spacing():
+    service = _service()
+
+    assert service._build_cache_key("tenant", "How do I  reset the VPN?", 5, 0.3, {}) == service._build_cache_key(
+        "tenant", "how do i reset the ＶＰＮ?", 5, 0.3, {}
+    )
+
+
+class _MemoryCache:
+    def __init__(self) -> None:
+        self.entries: dict[tuple, tuple[dict, int | None]] = {}
+
+    async def get_json(self, *parts):
+        entry = self.entries.get(parts)
+        return entry[0] if entry else None
+
+    async def set_json(self, value, *parts, ttl=None):
+        self.entries[parts] = (value, ttl)
+
+
+class _CountingEmbeddings:
+    model_name = "stub-model"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def embed_text(self, text):
+        self.calls += 1
+        return [0.1, 0.2]
+
+
+class _EmptyVectorService:
+    async def search_documents(self, **_):
+        return VectorSearchResults(items=[], next_offset=None, has_more=False)
+
+
+@pytest.mark.anyio
+async def test_empty_results_use_short_ttl_and_embeddings_are_reused():
+    cache = _MemoryCache()
+    embeddings = _CountingEmbeddings()
+    service = RetrievalService(
+        embedding_service=embeddings,  # type: ignore[arg-type]
+        vector_service=_EmptyVectorService(),  # type: ignore[arg-type]
+        cache_service=cache,  # type: ignore[arg-type]
+    )
+
+    await service.search_documents(tenant_id="t1", query="unknown runbook", limit=3)
+    await service.search_documents(tenant_id="t2", query="unknown runbook", limit=3)
+
+    assert embeddings.calls == 1
+    result_ttls = [ttl for parts, (_, ttl) in cache.entries.items() if parts[0] != "embedding"]
+    assert result_ttls == [settings.negative_cache_ttl_seconds] * 2
+
+
+@pytest.mark.anyio
+async def test_cached_results_cancel_speculative_embedding():
+    cache = _MemoryCache()
+    embeddings = _CountingEmbeddings()
+    service = RetrievalService(
+        embedding_service=embeddings,  # type: ignore[arg-type]
+        vector_service=_EmptyVectorService(),  # type: ignore[arg-type]
+        cache_service=cache,  # type: ignore[arg-type]
+    )
+    cache_key = service._build_cache_key("t1", "vpn", 3, 0.3, {})
+    cached = VectorSearchResults(items=[{"chunk_id": "c1", "text": "cached"}], next_offset=None, has_more=False)
+    await cache.set_json(cached.to_payload(), cache_key)
+
+    results = await service.search_documents(tenant_id="t1", query="vpn", limit=3, score_threshold=0.3)
+
+    assert [item["chunk_id"] for item in results.items] == ["c1"]
+    assert embeddings.calls == 0
+
+
+class _FailingCache(_MemoryCache):
+    async def get_json(self, *parts):
+        if parts[0] == "embedding":
+            return None
+        # Let the speculative embedding reach the model before the result lookup fails.
+        await asyncio.sleep(0)
+        raise ConnectionError("redis unavailable")
+
+
+class _BlockingEmbeddings:
+    model_name = "stub-model"
+
+    def __init__(self) -> None:
+        self.cancelled = False
+
+    async def embed_text(self, text):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+@pytest.mark.anyio
+async def test_cache_lookup_failure_cancels_speculative_embedding():
+    embeddings = _BlockingEmbeddings()
+    service = RetrievalService(
+        embedding_service=embeddings,  # type: ignore[arg-type]
+        vector_service=_EmptyVectorService(),  # type: ignore[arg-type]
+        cache_service=_FailingCache(),  # type: ignore[arg-type]
+    )
+
+    with pytest.raises(ConnectionError):
+        await service.search_documents(tenant_id="t1", query="vpn", limit=3, use_cache=True)
+
+    assert embeddings.cancelled
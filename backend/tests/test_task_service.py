@@ -0,0 +1,151 @@
+"""Tests for task and incident service queries."""
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.models.task import IncidentSeverity, IncidentStatus, TaskPriority, TaskStatus
+from app.models.tenant import Tenant, TenantUser
+from app.schemas.task import TaskCreate
+from app.services.task_service import IncidentService, TaskService
+
+
+@pytest.fixture
+def tenant(db_session):
+    record = Tenant(name="Ops Corp", subdomain="ops")
+    db_session.add(record)
+    db_session.commit()
+    return record
+
+
+def _create_incident(service, db_session, tenant, title, severity, status_value):
+    return service.create_incident(
+        db_session,
+        tenant.id,
+        reporter_id=None,
+        title=title,
+        description=None,
+        severity=severity,
+        status_value=status_value,
+        tags=None,
+        impacted_systems=None,
+        metadata=None,
+        summary=None,
+    )
+
+
+def test_summarize_incidents_aggregates_by_severity_and_status(db_session, tenant):
+    service = IncidentService()
+    _create_incident(service, db_session, tenant, "VPN down", IncidentSeverity.HIGH, IncidentStatus.OPEN)
+    _create_incident(service, db_session, tenant, "DNS flap", IncidentSeverity.HIGH, IncidentStatus.RESOLVED)
+    _create_incident(service, db_session, tenant, "Slow wiki", IncidentSeverity.LOW, IncidentStatus.OPEN)
+
+    summary = service.summarize_incidents(db_session, tenant.id, timeframe_days=7)
+
+    assert summary["total_incidents"] == 3
+    assert (summary["open_incidents"], summary["resolved_incidents"]) == (2, 1)
+    assert summary["incidents_by_severity"] == {"high": 2, "low": 1}
+    assert summary["incidents_by_status"] == {"open": 2, "resolved": 1}
+    assert {incident.title for incident in summary["recent_incidents"]} == {"VPN down", "DNS flap", "Slow wiki"}
+
+
+def test_list_tasks_returns_page_with_filtered_total(db_session, tenant):
+    service = TaskService()
+    for index in range(5):
+        service.create_task(
+            db_session,
+            tenant.id,
+            creator_id=None,
+            title=f"Task {index}",
+            description=None,
+            priority=TaskPriority.HIGH if index % 2 else TaskPriority.LOW,
+            tags=None,
+            metadata=None,
+            due_date=None,
+            assigned_to_id=None,
+        )
+
+    items, total = service.list_tasks(db_session, tenant.id, skip=0, limit=2)
+    assert (len(items), total) == (2, 5)
+
+    items, total = service.list_tasks(db_session, tenant.id, priority_filter=TaskPriority.HIGH)
+    assert (len(items), total) == (2, 2)
+
+    items, total = service.list_tasks(db_session, tenant.id, skip=10, limit=2, status_filter=TaskStatus.OPEN)
+    assert (items, total) == ([], 5)
+
+
+def test_list_tasks_can_prefetch_people_in_batches(db_session, tenant):
+    owner = TenantUser(tenant=tenant, email="owner@example.com", username="owner", hashed_password="hashed")
+    db_session.add(owner)
+    db_session.flush()
+    service = TaskService()
+    for index in range(3):
+        service.create_task(
+            db_session,
+            tenant.id,
+            creator_id=owner.id,
+            title=f"Task {index}",
+            description=None,
+            priority=TaskPriority.MEDIUM,
+            tags=None,
+            metadata=None,
+            due_date=None,
+            assigned_to_id=owner.id,
+        )
+    tenant_id = tenant.id
+    db_session.expire_all()
+
+    statements: list[str] = []
+    engine = db_session.get_bind()
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        items, _ = service.list_tasks(db_session, tenant_id, load_people=True)
+        assert {task.assigned_to.username for task in items} == {"owner"}
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 3
+
+
+def test_create_tasks_bulk_commits_once_and_validates_assignees(db_session, tenant):
+    service = TaskService()
+    specs = [TaskCreate(title="Rotate keys"), TaskCreate(title="Patch VPN", priority=TaskPriority.HIGH)]
+
+    created = service.create_tasks_bulk(db_session, tenant.id, None, specs)
+
+    assert [task.title for task in created] == ["Rotate keys", "Patch VPN"]
+    assert {task.status for task in created} == {TaskStatus.OPEN.value}
+    assert service.list_tasks(db_session, tenant.id)[1] == 2
+
+    with pytest.raises(HTTPException):
+        service.create_tasks_bulk(db_session, tenant.id, None, [TaskCreate(title="Orphan", assigned_to_id=uuid4())])
+
+
+def test_update_incident_dispatches_status_and_metadata(db_session, tenant):
+    service = IncidentService()
+    incident = _create_incident(service, db_session, tenant, "VPN down", IncidentSeverity.LOW, IncidentStatus.OPEN)
+
+    updated = service.update_incident(
+        db_session,
+        tenant.id,
+        incident.id,
+        {
+            "status": IncidentStatus.RESOLVED,
+            "severity": IncidentSeverity.CRITICAL,
+            "metadata": {"ticket": "INC-1"},
+            "tags": ["vpn"],
+        },
+    )
+
+    assert (updated.status, updated.severity) == ("resolved", "critical")
+    assert updated.resolved_at is not None
+    assert updated.incident_metadata == {"ticket": "INC-1"}
+    assert updated.tags == ["vpn"]
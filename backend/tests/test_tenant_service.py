@@ -0,0 +1,218 @@
+"""Tests for tenant service aggregate queries."""
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.models.document import Document
+from app.models.tenant import Tenant, TenantUser
+from app.services.tenant_service import TenantService
+
+
+def _document(tenant_id, index: int, status: str = "processed") -> Document:
+    return Document(
+        tenant_id=tenant_id,
+        filename=f"doc{index}.txt",
+        original_filename=f"doc{index}.txt",
+        content_type="text/plain",
+        file_size=1,
+        file_path=f"/tmp/doc{index}.txt",
+        status=status,
+    )
+
+
+def test_get_tenant_stats_counts_users_and_documents(db_session):
+    service = TenantService()
+    tenant = service.create_tenant(db_session, name="Stats Corp", subdomain="stats")
+    db_session.add_all(
+        [
+            TenantUser(tenant_id=tenant.id, email="a@example.com", username="a", hashed_password="x"),
+            TenantUser(tenant_id=tenant.id, email="b@example.com", username="b", hashed_password="x", is_active=False),
+        ]
+    )
+    db_session.commit()
+
+    empty = service.get_tenant_stats(db_session, tenant.id)
+    assert (empty["user_count"], empty["document_count"], empty["processed_document_count"]) == (1, 0, 0)
+
+    db_session.add_all(
+        [_document(tenant.id, index, status) for index, status in enumerate(["processed", "processed", "pending"])]
+    )
+    db_session.commit()
+
+    stats = service.get_tenant_stats(db_session, tenant.id)
+    assert (stats["user_count"], stats["document_count"], stats["processed_document_count"]) == (1, 3, 2)
+
+
+def test_validate_document_quota_stops_at_the_limit(db_session):
+    service = TenantService()
+    tenant = service.create_tenant(db_session, name="Quota Corp", subdomain="quota")
+    tenant.max_documents = 2
+    db_session.commit()
+
+    assert service.validate_tenant_quota(db_session, tenant.id, "documents") is True
+    db_session.add(_document(tenant.id, 0))
+    db_session.commit()
+    assert service.validate_tenant_quota(db_session, tenant.id, "documents") is True
+    db_session.add(_document(tenant.id, 1))
+    db_session.commit()
+    assert service.validate_tenant_quota(db_session, tenant.id, "documents") is False
+    assert service.validate_tenant_quota(db_session, tenant.id, "documents", current_count=1) is True
+
+
+def test_tenant_lookups_are_cached_until_updated(db_session):
+    service = TenantService()
+    tenant = service.create_tenant(db_session, name="Cache Corp", subdomain="cache")
+    tenant_id = tenant.id
+    assert service.get_tenant_by_id(db_session, tenant_id) is not None
+    db_session.expunge_all()
+
+    statements: list[str] = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        cached = service.get_tenant_by_id(db_session, tenant_id)
+        by_subdomain = service.get_tenant_by_subdomain(db_session, "cache")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert statements == []
+    assert cached is by_subdomain
+    assert cached.name == "Cache Corp"
+
+    service.update_tenant(db_session, tenant_id, {"name": "Renamed Corp"})
+    assert service.get_tenant_by_subdomain(db_session, "cache").name == "Renamed Corp"
+
+    service.deactivate_tenant(db_session, tenant_id)
+    assert service.get_tenant_by_id(db_session, tenant_id) is None
+
+
+def test_cache_hit_keeps_pending_edits_on_the_session_instance(db_session):
+    service = TenantService()
+    tenant = service.create_tenant(db_session, name="Orig Corp", subdomain="orig")
+    loaded = service.get_tenant_by_id(db_session, tenant.id)
+    loaded.name = "Pending edit"
+
+    assert service.get_tenant_by_id(db_session, tenant.id) is loaded
+    assert loaded.name == "Pending edit"
+    assert db_session.is_modified(loaded)
+
+
+def test_update_tenant_ignores_unknown_fields_and_rejects_inactive(db_session):
+    service = TenantService(cache_ttl_seconds=0)
+    tenant = service.create_tenant(db_session, name="Bulk Corp", subdomain="bulk")
+
+    updated = service.update_tenant(
+        db_session, tenant.id, {"max_documents": 5, "is_active": False, "llm_model": "gpt-4o"}
+    )
+
+    assert updated is tenant
+    assert (updated.max_documents, updated.llm_model, updated.is_active) == (5, "gpt-4o", True)
+    assert service.update_tenant(db_session, tenant.id, {"unknown": 1}) is tenant
+
+    service.deactivate_tenant(db_session, tenant.id)
+    with pytest.raises(HTTPException) as exc_info:
+        service.update_tenant(db_session, tenant.id, {"name": "Ghost"})
+    assert exc_info.value.status_code == 404
+
+
+def test_create_tenant_rejects_duplicate_subdomain_without_precheck(db_session):
+    service = TenantService()
+    service.create_tenant(db_session, name="First Corp", subdomain="dup")
+
+    statements: list[str] = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            service.create_tenant(db_session, name="Second Corp", subdomain="dup")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert exc_info.value.status_code == 400
+    assert len(statements) == 1
+    assert "ON CONFLICT" in statements[0]
+    assert service.create_tenant(db_session, name="No Subdomain").subdomain is None
+
+
+def test_create_tenant_conflict_keeps_callers_pending_work(db_session):
+    service = TenantService()
+    service.create_tenant(db_session, name="Taken Corp", subdomain="taken")
+    pending = Tenant(name="Pending Corp", subdomain="pending", is_active=True)
+    db_session.add(pending)
+
+    with pytest.raises(HTTPException):
+        service.create_tenant(db_session, name="Clash Corp", subdomain="taken")
+    db_session.commit()
+
+    assert service.get_tenant_by_subdomain(db_session, "pending") is not None
+
+
+def test_list_tenants_pages_by_keyset_cursor(db_session):
+    service = TenantService()
+    created = {service.create_tenant(db_session, name=f"Page Corp {index}").id for index in range(5)}
+
+    seen = []
+    after = None
+    while True:
+        page = service.list_tenants(db_session, limit=2, after=after)
+        if not page:
+            break
+        seen.extend(page)
+        after = (page[-1].created_at, page[-1].id)
+
+    ids = [tenant.id for tenant in seen]
+    assert len(ids) == len(set(ids))
+    assert created <= set(ids)
+    keys = [(tenant.created_at, tenant.id) for tenant in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_get_tenant_by_identifier_accepts_uuid_or_subdomain(db_session):
+    service = TenantService(cache_ttl_seconds=0)
+    tenant = service.create_tenant(db_session, name="Lookup Corp", subdomain="lookup")
+
+    assert service.get_tenant_by_identifier(db_session, str(tenant.id)) is tenant
+    assert service.get_tenant_by_identifier(db_session, tenant.id.hex) is tenant
+    assert service.get_tenant_by_identifier(db_session, "lookup") is tenant
+    assert service.get_tenant_by_identifier(db_session, "x" * 36) is None
+
+
+def test_get_tenants_stats_bulk_groups_per_tenant(db_session):
+    service = TenantService()
+    busy = service.create_tenant(db_session, name="Busy Corp")
+    idle = service.create_tenant(db_session, name="Idle Corp")
+    db_session.add(TenantUser(tenant_id=busy.id, email="a@example.com", username="a", hashed_password="x"))
+    db_session.add_all([_document(busy.id, index, status) for index, status in enumerate(["processed", "pending"])])
+    db_session.commit()
+
+    stats = service.get_tenants_stats_bulk(db_session, [busy.id, idle.id])
+
+    assert stats == {
+        busy.id: {"user_count": 1, "document_count": 2, "processed_document_count": 1},
+        idle.id: {"user_count": 0, "document_count": 0, "processed_document_count": 0},
+    }
+    assert service.get_tenants_stats_bulk(db_session, []) == {}
+
+
+def test_get_tenant_by_identifier_passes_parsed_uuid_through(db_session, monkeypatch):
+    service = TenantService()
+    received = []
+    monkeypatch.setattr(service, "get_tenant_by_id", lambda db, tenant_id: received.append(tenant_id))
+    tenant_id = uuid.uuid4()
+
+    service.get_tenant_by_identifier(db_session, str(tenant_id))
+
+    assert received == [tenant_id]
+    assert isinstance(received[0], uuid.UUID)
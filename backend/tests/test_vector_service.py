@@ -0,0 +1,151 @@
+"""Unit tests for Qdrant vector service batching."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services.vector_service import QdrantVectorService
+
+
+@pytest.fixture(scope="module")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+class _RecordingClient:
+    def __init__(self, fail_on_call: int | None = None, hits: list | None = None) -> None:
+        self.batches: list[list] = []
+        self.hits = hits or []
+        self.search_kwargs: dict = {}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.fail_on_call = fail_on_call
+
+    async def upsert(self, collection_name, points):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            if self.fail_on_call is not None and len(self.batches) == self.fail_on_call:
+                raise RuntimeError("qdrant unavailable")
+            self.batches.append(points)
+        finally:
+            self.in_flight -= 1
+
+    async def search(self, **kwargs):
+        self.search_kwargs = kwargs
+        return self.hits
+
+
+def test_services_share_one_async_client():
+    assert QdrantVectorService().async_client is QdrantVectorService().async_client
+    assert not hasattr(QdrantVectorService(), "client")
+
+
+def _documents(count: int) -> list[dict]:
+    return [
+        {"document_id": "doc-1", "chunk_id": f"chunk-{index}", "text": f"chunk {index}", "embedding": [0.1, 0.2]}
+        for index in range(count)
+    ]
+
+
+@pytest.mark.anyio
+async def test_add_documents_upserts_in_bounded_batches(monkeypatch):
+    monkeypatch.setattr(settings, "qdrant_upsert_batch_size", 2)
+    monkeypatch.setattr(settings, "qdrant_upsert_concurrency", 2)
+    service = QdrantVectorService()
+    service.async_client = _RecordingClient()
+
+    assert await service.add_documents("tenant-1", _documents(5)) is True
+
+    assert [len(batch) for batch in service.async_client.batches] == [2, 2, 1]
+    assert service.async_client.peak_in_flight == 2
+    first = service.async_client.batches[0][0]
+    assert first.payload["tenant_id"] == "tenant-1"
+    assert first.payload["chunk_id"] == "chunk-0"
+
+
+@pytest.mark.anyio
+async def test_add_documents_reports_failed_batch(monkeypatch):
+    monkeypatch.setattr(settings, "qdrant_upsert_batch_size", 2)
+    service = QdrantVectorService()
+    service.async_client = _RecordingClient(fail_on_call=1)
+
+    assert await service.add_documents("tenant-1", _documents(4)) is False
+
+
+@pytest.mark.anyio
+async def test_add_documents_accepts_embedding_matrix():
+    service = QdrantVectorService()
+    service.async_client = _RecordingClient()
+    documents = [{"document_id": "doc-1", "chunk_id": f"chunk-{index}"} for index in range(2)]
+
+    matrix = np.array([[0.5, 0.25], [1.0, 0.0]], dtype=np.float64)
+    assert await service.add_documents("tenant-1", documents, embeddings=matrix) is True
+    assert [point.vector for point in service.async_client.batches[0]] == [[0.5, 0.25], [1.0, 0.0]]
+
+    assert await service.add_documents("tenant-1", documents, embeddings=matrix[:1]) is False
+
+
+@pytest.mark.anyio
+async def test_add_documents_uses_deterministic_point_ids():
+    service = QdrantVectorService()
+    service.async_client = _RecordingClient()
+    documents = _documents(2) + [{"document_id": "doc-2", "chunk_index": 0, "embedding": [0.3, 0.4]}]
+
+    await service.add_documents("tenant-1", documents)
+    await service.add_documents("tenant-1", documents)
+
+    first, retry = ([point.id for point in batch] for batch in service.async_client.batches)
+    assert first == retry
+    assert len(set(first)) == 3
+    assert first[0] == QdrantVectorService.point_id("tenant-1", "doc-1", "chunk-0")
+    assert first[0] != QdrantVectorService.point_id("tenant-2", "doc-1", "chunk-0")
+
+
+@pytest.mark.anyio
+async def test_search_documents_splits_payload_into_metadata():
+    hit = SimpleNamespace(
+        id="point-1",
+        score=0.9,
+        payload={
+            "text": "Restart the gateway",
+            "document_id": "doc-1",
+            "chunk_index": 2,
+            "page_number": 4,
+            "tags": ["vpn"],
+        },
+    )
+    service = QdrantVectorService()
+    service.async_client = _RecordingClient(hits=[hit])
+
+    results = await service.search_documents("tenant-1", [0.1, 0.2], limit=5)
+
+    assert results.has_more is False
+    item = results.items[0]
+    assert (item["text"], item["chunk_index"], item["page_number"]) == ("Restart the gateway", 2, 4)
+    assert item["metadata"] == {"page_number": 4, "tags": ["vpn"]}
+    assert service.async_client.search_kwargs["with_payload"].exclude == ["tenant_id"]
+
+
+@pytest.mark.anyio
+async def test_search_documents_can_project_payload_fields():
+    service = QdrantVectorService()
+    service.async_client = _RecordingClient(hits=[])
+
+    await service.search_documents("tenant-1", [0.1, 0.2], payload_fields=["document_type", "text"])
+
+    selector = service.async_client.search_kwargs["with_payload"]
+    assert selector.include == [
+        "text",
+        "document_id",
+        "chunk_id",
+        "source",
+        "page_number",
+        "chunk_index",
+        "document_type",
+    ]